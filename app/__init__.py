@@ -1,26 +1,54 @@
 from flask import Flask, request, session
 from flask_sqlalchemy import SQLAlchemy
-from flask_login import LoginManager
-from flask_migrate import Migrate
-from flask_wtf.csrf import CSRFProtect
-from flask_babel import Babel
 import os
 
 db = SQLAlchemy()
-login_manager = LoginManager()
-migrate = Migrate()
-csrf = CSRFProtect()
-babel = Babel()
+
+# Extensions used only by the main app are created on first access, so that
+# importing app.models (e.g. from the share server) doesn't load
+# Flask-Migrate/Alembic, Flask-WTF and Flask-Babel
+_LAZY_EXTENSIONS = {
+    'login_manager': ('flask_login', 'LoginManager'),
+    'migrate': ('flask_migrate', 'Migrate'),
+    'csrf': ('flask_wtf.csrf', 'CSRFProtect'),
+    'babel': ('flask_babel', 'Babel')
+}
+
+def __getattr__(name):
+    if name in _LAZY_EXTENSIONS:
+        import importlib
+        module_name, class_name = _LAZY_EXTENSIONS[name]
+        extension = getattr(importlib.import_module(module_name), class_name)()
+        globals()[name] = extension
+        return extension
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def create_app(config_name='default'):
+    from app import login_manager, migrate, csrf, babel
     app = Flask(__name__)
     
     # Load configuration
     from config import config
     app.config.from_object(config[config_name])
     
+    from app.utils.sqlite_pragmas import engine_options
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(
+        app.config['SQLALCHEMY_DATABASE_URI'], app.config.get('SQLALCHEMY_ENGINE_OPTIONS')
+    )
+    
     # Initialize extensions
     db.init_app(app)
+    
+    # Registered first so its after_request hook runs last, on the final body
+    from app.utils.compression import init_compression
+    init_compression(app)
+    
+    with app.app_context():
+        from app.utils.sqlite_pragmas import register_sqlite_pragmas
+        register_sqlite_pragmas(db.engine, app.config.get('SQLITE_PRAGMAS'))
+        
+        from app.utils.request_timing import init_request_timing
+        init_request_timing(app, db.engine)
     login_manager.init_app(app)
     migrate.init_app(app, db)
     csrf.init_app(app)
@@ -59,14 +87,29 @@ def create_app(config_name='default'):
         }
     
     # User loader function
+    from app.utils.user_cache import user_identity_cache, load_user_identity
+    user_identity_cache.ttl = app.config['USER_CACHE_TTL']
+    
     @login_manager.user_loader
     def load_user(user_id):
-        from app.models.user import User
-        return User.query.get(int(user_id))
+        return load_user_identity(int(user_id))
+    
+    from app.utils.share_cache import share_page_cache
+    share_page_cache.max_entries = app.config['SHARE_CACHE_MAX_ENTRIES']
+    
+    from app.utils.fragment_cache import init_fragment_cache
+    init_fragment_cache(app)
+    
+    from app.utils.query_cache import init_query_cache
+    init_query_cache(app)
+    
+    from app.utils.hashtag_suggestions import init_hashtag_suggestions
+    init_hashtag_suggestions(app)
     
     # Create upload directories if they don't exist
     os.makedirs(app.config['PDF_UPLOAD_FOLDER'], exist_ok=True)
     os.makedirs(app.config['IMAGE_UPLOAD_FOLDER'], exist_ok=True)
+    os.makedirs(app.config['EXPORT_CACHE_FOLDER'], exist_ok=True)
     
     # Import models to ensure they're registered with SQLAlchemy
     from app.models import User, Post, Image, RegistrationToken
@@ -76,4 +119,20 @@ def create_app(config_name='default'):
     from app.routes import register_blueprints
     register_blueprints(app)
     
+    # Uploaded media with ownership checks (media_url() template helper)
+    from app.utils.media import init_media
+    init_media(app)
+    
+    # Content-hashed static assets (static_url() template helper)
+    from app.utils.static_assets import init_static_assets
+    init_static_assets(app)
+    
+    # Prometheus request metrics
+    from app.utils.metrics import init_metrics
+    init_metrics(app)
+    
+    # On-demand request profiling
+    from app.utils.profiling import init_profiling
+    init_profiling(app)
+    
     return app
\ No newline at end of file
@@ -2,5 +2,9 @@ from .user import User
 from .post import Post
 from .image import Image
 from .registration_token import RegistrationToken
+from .hashtag import Hashtag
+from . import post_signature  # MinHash/LSH tables and their Post events
+from .post_metric import PostMetric
+from . import analytics_rollup  # analytics rollup tables and their Post events
 
-__all__ = ['User', 'Post', 'Image', 'RegistrationToken']
\ No newline at end of file
+__all__ = ['User', 'Post', 'Image', 'RegistrationToken', 'Hashtag', 'PostMetric']
\ No newline at end of file
@@ -0,0 +1,189 @@
+from app import db
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import object_session
+from app.models.hashtag import post_hashtags
+from app.models.post import Post
+from app.models.post_metric import PostMetric
+
+# Per-user sums over posts and their latest metric capture, so dashboard and
+# analytics read a handful of rows instead of aggregating the whole library.
+# measured_posts counts posts with a capture, impression_posts those whose
+# capture includes impressions (the averages' denominators).
+ROLLUP_COLUMNS = ('posts', 'measured_posts', 'likes', 'comments', 'impressions', 'impression_posts')
+
+
+def _sum_columns():
+    return [db.Column(name, db.Integer, nullable=False, default=0) for name in ROLLUP_COLUMNS]
+
+
+# month is 'YYYY-MM' of the post's created_at
+user_monthly_rollups = db.Table(
+    'user_monthly_rollups',
+    db.Column('user_id', db.Integer, db.ForeignKey('users.id'), primary_key=True),
+    db.Column('month', db.String(7), primary_key=True),
+    *_sum_columns()
+)
+
+user_hashtag_rollups = db.Table(
+    'user_hashtag_rollups',
+    db.Column('user_id', db.Integer, db.ForeignKey('users.id'), primary_key=True),
+    db.Column('hashtag_id', db.Integer, db.ForeignKey('hashtags.id'), primary_key=True),
+    *_sum_columns(),
+    db.Index('idx_user_hashtag_rollups_user_posts', 'user_id', 'posts')
+)
+
+LOOKUP_CHUNK = 500  # post ids per IN (...) list
+
+
+def month_expression(column, dialect):
+    """'YYYY-MM' of a datetime column in SQL for ``dialect`` (a dialect name)"""
+    if dialect == 'postgresql':
+        return func.to_char(column, 'YYYY-MM')
+    if dialect in ('mysql', 'mariadb'):
+        return func.date_format(column, '%Y-%m')
+    return func.strftime('%Y-%m', column)
+
+
+def _values(metrics):
+    """Rollup column values contributed by one post with latest capture ``metrics`` (or None)"""
+    likes, comments, impressions = metrics or (0, 0, None)
+    return (1, 1 if metrics else 0, likes, comments, impressions or 0, 0 if impressions is None else 1)
+
+
+def _contributions(connection, post_ids):
+    """{post_id: (user_id, month, frozenset(hashtag_ids), values)} read from the current tables"""
+    posts = Post.__table__
+    metrics = PostMetric.__table__
+    post_ids = sorted(post_ids)
+    result = {}
+    for start in range(0, len(post_ids), LOOKUP_CHUNK):
+        chunk = post_ids[start:start + LOOKUP_CHUNK]
+        tags = {}
+        for post_id, hashtag_id in connection.execute(
+                select(post_hashtags.c.post_id, post_hashtags.c.hashtag_id).where(post_hashtags.c.post_id.in_(chunk))):
+            tags.setdefault(post_id, set()).add(hashtag_id)
+        latest = {row[0]: tuple(row[1:]) for row in connection.execute(
+            select(metrics.c.post_id, metrics.c.likes, metrics.c.comments, metrics.c.impressions)
+            .where(metrics.c.post_id.in_(chunk), metrics.c.is_latest.is_(True)))}
+        for post_id, user_id, created_at in connection.execute(
+                select(posts.c.id, posts.c.user_id, posts.c.created_at).where(posts.c.id.in_(chunk))):
+            month = created_at.strftime('%Y-%m') if created_at else None
+            result[post_id] = (user_id, month, frozenset(tags.get(post_id, ())), _values(latest.get(post_id)))
+    return result
+
+
+def _add(deltas, key, values, sign):
+    current = deltas.get(key, (0,) * len(ROLLUP_COLUMNS))
+    deltas[key] = tuple(total + sign * value for total, value in zip(current, values))
+
+
+def _apply(connection, table, key_columns, deltas):
+    """Add ``deltas`` {key tuple: values} to ``table``, creating and dropping rows as needed"""
+    for key, values in deltas.items():
+        if not any(values):
+            continue
+        where = [table.c[name] == value for name, value in zip(key_columns, key)]
+        updated = connection.execute(table.update().where(*where).values(
+            {name: table.c[name] + value for name, value in zip(ROLLUP_COLUMNS, values)}))
+        if not updated.rowcount:
+            connection.execute(table.insert().values(dict(zip(key_columns + ROLLUP_COLUMNS, key + values))))
+        connection.execute(table.delete().where(*where, table.c.posts <= 0))
+
+
+def apply_changes(connection, before, after):
+    """Move the rollups from the ``before`` to the ``after`` contributions of the same posts"""
+    monthly, hashtags = {}, {}
+    for contributions, sign in ((before, -1), (after, 1)):
+        for user_id, month, hashtag_ids, values in contributions.values():
+            if month:
+                _add(monthly, (user_id, month), values, sign)
+            for hashtag_id in hashtag_ids:
+                _add(hashtags, (user_id, hashtag_id), values, sign)
+    _apply(connection, user_monthly_rollups, ('user_id', 'month'), monthly)
+    _apply(connection, user_hashtag_rollups, ('user_id', 'hashtag_id'), hashtags)
+
+
+def rebuild_rollups(connection, user_id=None):
+    """Recompute the rollups from posts, post_hashtags and post_metrics; returns (month rows, hashtag rows)"""
+    posts = Post.__table__
+    metrics = PostMetric.__table__
+    sums = [
+        func.count(posts.c.id),
+        func.count(metrics.c.id),
+        func.coalesce(func.sum(metrics.c.likes), 0),
+        func.coalesce(func.sum(metrics.c.comments), 0),
+        func.coalesce(func.sum(metrics.c.impressions), 0),
+        func.count(metrics.c.impressions)
+    ]
+    measured = posts.outerjoin(metrics, (metrics.c.post_id == posts.c.id) & metrics.c.is_latest.is_(True))
+    month = month_expression(posts.c.created_at, connection.dialect.name)
+
+    monthly_query = select(posts.c.user_id, month, *sums).select_from(measured)\
+        .where(posts.c.created_at.isnot(None)).group_by(posts.c.user_id, month)
+    hashtag_query = select(post_hashtags.c.user_id, post_hashtags.c.hashtag_id, *sums)\
+        .select_from(measured.join(post_hashtags, post_hashtags.c.post_id == posts.c.id))\
+        .group_by(post_hashtags.c.user_id, post_hashtags.c.hashtag_id)
+    if user_id is not None:
+        monthly_query = monthly_query.where(posts.c.user_id == user_id)
+        hashtag_query = hashtag_query.where(post_hashtags.c.user_id == user_id)
+
+    counts = []
+    for table, key_columns, query in ((user_monthly_rollups, ('user_id', 'month'), monthly_query),
+                                      (user_hashtag_rollups, ('user_id', 'hashtag_id'), hashtag_query)):
+        delete = table.delete()
+        if user_id is not None:
+            delete = delete.where(table.c.user_id == user_id)
+        connection.execute(delete)
+        rows = [dict(zip(key_columns + ROLLUP_COLUMNS, row)) for row in connection.execute(query)]
+        if rows:
+            connection.execute(table.insert(), rows)
+        counts.append(len(rows))
+    return tuple(counts)
+
+
+def rollups_missing(connection):
+    """True if there are posts but no monthly rollups, e.g. right after the tables were created"""
+    has_posts = connection.execute(select(Post.__table__.c.id).limit(1)).first() is not None
+    has_rollups = connection.execute(select(user_monthly_rollups.c.user_id).limit(1)).first() is not None
+    return has_posts and not has_rollups
+
+
+# A post's contribution depends on its row, its post_hashtags rows and its
+# latest capture, which the hashtag and metric events rewrite during the same
+# flush. So the state before the change is read in before_* (inserted ahead of
+# those listeners) and the state after it once the flush is done, and only the
+# difference is applied. Core writes outside the ORM (the backfills, seed_db.py)
+# need rebuild_rollups().
+def _track(target, connection, before):
+    session = object_session(target)
+    if session is None:
+        return
+    changes = session.info.setdefault('rollup_changes', {})
+    if target.id not in changes:
+        changes[target.id] = _contributions(connection, [target.id]).get(target.id) if before else None
+
+
+@event.listens_for(Post, 'before_update', insert=True)
+@event.listens_for(Post, 'before_delete', insert=True)
+def _track_existing_post(mapper, connection, target):
+    _track(target, connection, before=True)
+
+
+@event.listens_for(Post, 'after_insert')
+def _track_new_post(mapper, connection, target):
+    _track(target, connection, before=False)
+
+
+@event.listens_for(db.session, 'after_flush')
+def _apply_tracked_changes(session, flush_context):
+    changes = session.info.pop('rollup_changes', None)
+    if not changes:
+        return
+    connection = session.connection()
+    before = {post_id: contribution for post_id, contribution in changes.items() if contribution}
+    apply_changes(connection, before, _contributions(connection, changes))
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _forget_tracked_changes(session):
+    session.info.pop('rollup_changes', None)
@@ -0,0 +1,129 @@
+from app import db
+import re
+from sqlalchemy import event, func, inspect, select
+from app.models.post import Post
+
+HASHTAG_PATTERN = re.compile(r'#?(\w+)')
+
+# user_id is copied from posts so per-user filtering and facet counts are
+# served from idx_post_hashtags_user_tag without touching the posts table
+post_hashtags = db.Table(
+    'post_hashtags',
+    db.Column('post_id', db.Integer, db.ForeignKey('posts.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('hashtag_id', db.Integer, db.ForeignKey('hashtags.id'), primary_key=True),
+    db.Column('user_id', db.Integer, db.ForeignKey('users.id'), nullable=False),
+    db.Index('idx_post_hashtags_user_tag', 'user_id', 'hashtag_id')
+)
+
+
+class Hashtag(db.Model):
+    __tablename__ = 'hashtags'
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False, index=True)
+
+    @classmethod
+    def top_for_user(cls, user_id, limit=15):
+        """[(name, post count)] of the user's most used hashtags"""
+        post_count = func.count(post_hashtags.c.post_id)
+        return [tuple(row) for row in db.session.query(cls.name, post_count)
+                .join(post_hashtags, post_hashtags.c.hashtag_id == cls.id)
+                .filter(post_hashtags.c.user_id == user_id)
+                .group_by(cls.id, cls.name)
+                .order_by(post_count.desc(), cls.name)
+                .limit(limit)]
+
+    @classmethod
+    def post_ids_for(cls, user_id, name):
+        """Subquery of the ids of the user's posts tagged ``name``"""
+        return select(post_hashtags.c.post_id).join(cls, cls.id == post_hashtags.c.hashtag_id).where(
+            post_hashtags.c.user_id == user_id, cls.name == normalize_hashtag(name)
+        )
+
+    def __repr__(self):
+        return f'<Hashtag #{self.name}>'
+
+
+def normalize_hashtag(name):
+    return name.lstrip('#').strip().lower()
+
+
+def parse_hashtags(text):
+    """Normalized, de-duplicated hashtag names from the free-text hashtags column"""
+    names = []
+    for match in HASHTAG_PATTERN.findall(text or ''):
+        name = normalize_hashtag(match)[:100]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def sync_post_hashtags(connection, post_id, user_id, text):
+    """Replace the post_hashtags rows of one post with the tags in ``text``"""
+    hashtags = Hashtag.__table__
+    names = parse_hashtags(text)
+    connection.execute(post_hashtags.delete().where(post_hashtags.c.post_id == post_id))
+    if not names:
+        return
+
+    ids = dict(connection.execute(select(hashtags.c.name, hashtags.c.id).where(hashtags.c.name.in_(names))).all())
+    missing = [name for name in names if name not in ids]
+    if missing:
+        connection.execute(hashtags.insert(), [{'name': name} for name in missing])
+        ids.update(connection.execute(select(hashtags.c.name, hashtags.c.id).where(hashtags.c.name.in_(missing))).all())
+
+    connection.execute(post_hashtags.insert(), [
+        {'post_id': post_id, 'hashtag_id': ids[name], 'user_id': user_id} for name in names
+    ])
+
+
+def backfill_hashtags(connection, batch_size=5000):
+    """Index every post that has hashtags but no post_hashtags rows yet; returns the number of posts indexed.
+
+    Used for posts written before the table existed and for bulk inserts that
+    bypass the ORM events (seed_db.py), so it works in batches instead of
+    syncing post by post. Posts whose text holds no valid tag get no rows and
+    are not counted, so a boot with nothing new to index reports 0.
+    """
+    posts = Post.__table__
+    hashtags = Hashtag.__table__
+    rows = connection.execute(
+        select(posts.c.id, posts.c.user_id, posts.c.hashtags)
+        .where(posts.c.hashtags.isnot(None), posts.c.hashtags != '',
+               posts.c.id.notin_(select(post_hashtags.c.post_id)))
+    ).all()
+
+    ids = dict(connection.execute(select(hashtags.c.name, hashtags.c.id)).all())
+    indexed = 0
+    for start in range(0, len(rows), batch_size):
+        batch = [(post_id, user_id, parse_hashtags(text)) for post_id, user_id, text in rows[start:start + batch_size]]
+        missing = {name for _, _, names in batch for name in names if name not in ids}
+        if missing:
+            connection.execute(hashtags.insert(), [{'name': name} for name in sorted(missing)])
+            ids.update(connection.execute(select(hashtags.c.name, hashtags.c.id).where(hashtags.c.name.in_(missing))).all())
+        links = [{'post_id': post_id, 'hashtag_id': ids[name], 'user_id': user_id}
+                 for post_id, user_id, names in batch for name in names]
+        if links:
+            connection.execute(post_hashtags.insert(), links)
+        indexed += sum(1 for _, _, names in batch if names)
+    return indexed
+
+
+# Every save path - the post form, copy, PDF import and ZIP import - goes
+# through the ORM, so the index is maintained here rather than in each route
+@event.listens_for(Post, 'after_insert')
+def _index_new_post(mapper, connection, target):
+    if target.hashtags:
+        sync_post_hashtags(connection, target.id, target.user_id, target.hashtags)
+
+
+@event.listens_for(Post, 'after_update')
+def _reindex_post(mapper, connection, target):
+    if inspect(target).attrs.hashtags.history.has_changes():
+        sync_post_hashtags(connection, target.id, target.user_id, target.hashtags)
+
+
+# SQLite only honours ON DELETE CASCADE with PRAGMA foreign_keys=ON
+@event.listens_for(Post, 'before_delete')
+def _unindex_post(mapper, connection, target):
+    connection.execute(post_hashtags.delete().where(post_hashtags.c.post_id == target.id))
@@ -1,5 +1,6 @@
 from app import db
 from datetime import datetime
+from sqlalchemy import event
 
 class Image(db.Model):
     __tablename__ = 'images'
@@ -26,4 +27,15 @@ class Image(db.Model):
         }
     
     def __repr__(self):
-        return f'<Image {self.filename}>'
\ No newline at end of file
+        return f'<Image {self.filename}>'
+
+
+# Adding or removing an image changes how the post renders, so bump the
+# post's updated_at - share pages and caches version on that column
+@event.listens_for(Image, 'after_insert')
+@event.listens_for(Image, 'after_delete')
+def _touch_post(mapper, connection, target):
+    posts = db.metadata.tables['posts']
+    connection.execute(
+        posts.update().where(posts.c.id == target.post_id).values(updated_at=datetime.utcnow())
+    )
@@ -0,0 +1,101 @@
+from app import db
+from datetime import datetime
+import re
+from sqlalchemy import event, inspect, select
+from app.models.post import Post
+
+# "12 Likes, 3 Kommentare, 1.500 Impressions" (linkedin_pdf_parser) and
+# "5 Likes, 2 Comments" (pdf_parser); German thousands separators allowed
+ENGAGEMENT_PATTERN = re.compile(r'(\d[\d.,]*)\s*(Likes?|Kommentare?|Comments?|Impressions?)', re.IGNORECASE)
+
+
+class PostMetric(db.Model):
+    """One capture of a post's engagement; the newest capture per post has is_latest set"""
+    __tablename__ = 'post_metrics'
+    __table_args__ = (
+        db.Index('idx_post_metrics_post_captured', 'post_id', 'captured_at'),
+        db.Index('idx_post_metrics_user_latest', 'user_id', 'is_latest'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    post_id = db.Column(db.Integer, db.ForeignKey('posts.id', ondelete='CASCADE'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    likes = db.Column(db.Integer, nullable=False, default=0)
+    comments = db.Column(db.Integer, nullable=False, default=0)
+    impressions = db.Column(db.Integer)  # not every export includes them
+    captured_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    is_latest = db.Column(db.Boolean, nullable=False, default=True)
+
+    def __repr__(self):
+        return f'<PostMetric post={self.post_id} likes={self.likes} comments={self.comments}>'
+
+
+def _metric_name(label):
+    label = label.lower()
+    if label.startswith('like'):
+        return 'likes'
+    if label.startswith('impression'):
+        return 'impressions'
+    return 'comments'
+
+
+def parse_engagement(text):
+    """{'likes': int, 'comments': int, 'impressions': int or None} from an engagement_stats string, or None"""
+    values = {}
+    for number, label in ENGAGEMENT_PATTERN.findall(text or ''):
+        values.setdefault(_metric_name(label), int(re.sub(r'[.,]', '', number)))
+    if not values:
+        return None
+    return {'likes': values.get('likes', 0), 'comments': values.get('comments', 0),
+            'impressions': values.get('impressions')}
+
+
+def record_metrics(connection, post_id, user_id, metrics, captured_at=None):
+    """Append a capture for one post and make it the latest"""
+    table = PostMetric.__table__
+    connection.execute(table.update().where(table.c.post_id == post_id, table.c.is_latest.is_(True))
+                       .values(is_latest=False))
+    connection.execute(table.insert().values(post_id=post_id, user_id=user_id, is_latest=True,
+                                             captured_at=captured_at or datetime.utcnow(), **metrics))
+
+
+def backfill_metrics(connection):
+    """Parse engagement_stats of posts without any capture; returns the number of posts captured"""
+    posts = Post.__table__
+    table = PostMetric.__table__
+    rows = connection.execute(
+        select(posts.c.id, posts.c.user_id, posts.c.engagement_stats, posts.c.updated_at)
+        .where(posts.c.engagement_stats.isnot(None), posts.c.engagement_stats != '',
+               posts.c.id.notin_(select(table.c.post_id)))
+    ).all()
+    captures = []
+    for post_id, user_id, text, updated_at in rows:
+        metrics = parse_engagement(text)
+        if metrics:
+            captures.append(dict(metrics, post_id=post_id, user_id=user_id, is_latest=True,
+                                 captured_at=updated_at or datetime.utcnow()))
+    if captures:
+        connection.execute(table.insert(), captures)
+    return len(captures)
+
+
+# Imports set engagement_stats; each new value becomes a capture
+@event.listens_for(Post, 'after_insert')
+def _capture_new_post(mapper, connection, target):
+    metrics = parse_engagement(target.engagement_stats)
+    if metrics:
+        record_metrics(connection, target.id, target.user_id, metrics)
+
+
+@event.listens_for(Post, 'after_update')
+def _capture_changed_stats(mapper, connection, target):
+    if inspect(target).attrs.engagement_stats.history.has_changes():
+        metrics = parse_engagement(target.engagement_stats)
+        if metrics:
+            record_metrics(connection, target.id, target.user_id, metrics)
+
+
+@event.listens_for(Post, 'before_delete')
+def _delete_metrics(mapper, connection, target):
+    table = PostMetric.__table__
+    connection.execute(table.delete().where(table.c.post_id == target.id))
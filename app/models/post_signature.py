@@ -0,0 +1,146 @@
+from app import db
+from sqlalchemy import event, inspect, select
+from app.models.post import Post
+
+# MinHash signature of each post's content (see app/utils/minhash.py); empty
+# for posts without words
+post_signatures = db.Table(
+    'post_signatures',
+    db.Column('post_id', db.Integer, db.ForeignKey('posts.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('user_id', db.Integer, db.ForeignKey('users.id'), nullable=False),
+    db.Column('signature', db.LargeBinary, nullable=False)
+)
+
+# LSH index: one bucket key per signature band
+post_lsh_buckets = db.Table(
+    'post_lsh_buckets',
+    db.Column('post_id', db.Integer, db.ForeignKey('posts.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('band', db.SmallInteger, primary_key=True),
+    db.Column('user_id', db.Integer, db.ForeignKey('users.id'), nullable=False),
+    db.Column('bucket', db.BigInteger, nullable=False),
+    db.Index('idx_post_lsh_buckets_user_bucket', 'user_id', 'bucket')
+)
+
+LOOKUP_CHUNK = 500  # bucket keys per IN (...) list
+
+
+def _delete_signature(connection, post_id):
+    connection.execute(post_lsh_buckets.delete().where(post_lsh_buckets.c.post_id == post_id))
+    connection.execute(post_signatures.delete().where(post_signatures.c.post_id == post_id))
+
+
+def _signature_rows(post_id, user_id, content):
+    """Signature row and LSH bucket rows of one post.
+
+    A post without words gets an empty signature and no buckets: it can never
+    match, and the backfill does not select it again.
+    """
+    from app.utils import minhash
+    sig = minhash.signature(content)
+    if sig is None:
+        return {'post_id': post_id, 'user_id': user_id, 'signature': b''}, []
+    signature_row = {'post_id': post_id, 'user_id': user_id, 'signature': minhash.to_bytes(sig)}
+    bucket_rows = [{'post_id': post_id, 'band': band, 'user_id': user_id, 'bucket': key}
+                   for band, key in enumerate(minhash.band_keys(sig))]
+    return signature_row, bucket_rows
+
+
+def sync_post_signature(connection, post_id, user_id, content):
+    """Replace the signature and LSH buckets of one post"""
+    _delete_signature(connection, post_id)
+    signature_row, bucket_rows = _signature_rows(post_id, user_id, content)
+    connection.execute(post_signatures.insert(), [signature_row])
+    if bucket_rows:
+        connection.execute(post_lsh_buckets.insert(), bucket_rows)
+
+
+def backfill_signatures(connection, batch_size=2000):
+    """Sign every post that has no signature yet; returns the number of posts with words signed.
+
+    Reads the unsigned posts ``batch_size`` at a time in id order, so only
+    one batch of content is in memory.
+    """
+    posts = Post.__table__
+    signed = 0
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            select(posts.c.id, posts.c.user_id, posts.c.content)
+            .where(posts.c.id > last_id, posts.c.id.notin_(select(post_signatures.c.post_id)))
+            .order_by(posts.c.id).limit(batch_size)
+        ).all()
+        if not rows:
+            return signed
+        last_id = rows[-1].id
+        signature_rows, bucket_rows = [], []
+        for post_id, user_id, content in rows:
+            signature_row, buckets = _signature_rows(post_id, user_id, content)
+            signature_rows.append(signature_row)
+            bucket_rows.extend(buckets)
+            if buckets:
+                signed += 1
+        connection.execute(post_signatures.insert(), signature_rows)
+        if bucket_rows:
+            connection.execute(post_lsh_buckets.insert(), bucket_rows)
+
+
+def find_near_duplicates(user_id, contents, limit=3):
+    """For each text in ``contents``: [(post_id, similarity)] of the user's posts it nearly duplicates.
+
+    Candidates come from the LSH bucket index, so the cost depends on the
+    number of texts and matches, not on the size of the user's library.
+    """
+    from app.utils import minhash
+    signatures = [minhash.signature(content) for content in contents]
+    keys_by_text = [minhash.band_keys(sig) if sig is not None else [] for sig in signatures]
+
+    all_keys = sorted({key for keys in keys_by_text for key in keys})
+    posts_by_bucket = {}
+    for start in range(0, len(all_keys), LOOKUP_CHUNK):
+        rows = db.session.execute(
+            select(post_lsh_buckets.c.bucket, post_lsh_buckets.c.post_id)
+            .where(post_lsh_buckets.c.user_id == user_id,
+                   post_lsh_buckets.c.bucket.in_(all_keys[start:start + LOOKUP_CHUNK]))
+        )
+        for bucket, post_id in rows:
+            posts_by_bucket.setdefault(bucket, set()).add(post_id)
+
+    candidate_ids = {post_id for post_ids in posts_by_bucket.values() for post_id in post_ids}
+    candidate_signatures = {}
+    candidate_list = sorted(candidate_ids)
+    for start in range(0, len(candidate_list), LOOKUP_CHUNK):
+        rows = db.session.execute(
+            select(post_signatures.c.post_id, post_signatures.c.signature)
+            .where(post_signatures.c.post_id.in_(candidate_list[start:start + LOOKUP_CHUNK]))
+        )
+        candidate_signatures.update((post_id, minhash.from_bytes(data)) for post_id, data in rows)
+
+    results = []
+    for sig, keys in zip(signatures, keys_by_text):
+        candidates = {post_id for key in keys for post_id in posts_by_bucket.get(key, ())}
+        matches = []
+        for post_id in candidates:
+            if post_id in candidate_signatures:
+                score = minhash.similarity(sig, candidate_signatures[post_id])
+                if score >= minhash.DUPLICATE_THRESHOLD:
+                    matches.append((post_id, score))
+        matches.sort(key=lambda match: -match[1])
+        results.append(matches[:limit])
+    return results
+
+
+# Signatures follow the content through every save path, like the hashtag index
+@event.listens_for(Post, 'after_insert')
+def _sign_new_post(mapper, connection, target):
+    sync_post_signature(connection, target.id, target.user_id, target.content)
+
+
+@event.listens_for(Post, 'after_update')
+def _resign_post(mapper, connection, target):
+    if inspect(target).attrs.content.history.has_changes():
+        sync_post_signature(connection, target.id, target.user_id, target.content)
+
+
+@event.listens_for(Post, 'before_delete')
+def _unsign_post(mapper, connection, target):
+    _delete_signature(connection, target.id)
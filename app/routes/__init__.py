@@ -5,10 +5,16 @@ def register_blueprints(app):
     from app.routes.upload import upload_bp
     from app.routes.admin import admin_bp
     from app.routes.export_import import export_import_bp
+    from app.routes.metrics import metrics_bp
+    from app.routes.media import media_bp
+    from app.routes.analytics import analytics_bp
     
     app.register_blueprint(auth_bp)
     app.register_blueprint(main_bp)
     app.register_blueprint(posts_bp)
     app.register_blueprint(upload_bp)
     app.register_blueprint(admin_bp)
-    app.register_blueprint(export_import_bp)
\ No newline at end of file
+    app.register_blueprint(export_import_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(media_bp)
+    app.register_blueprint(analytics_bp)
\ No newline at end of file
@@ -1,10 +1,13 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify
+from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, current_app, send_file, abort
 from flask_login import login_required, current_user
 from app import db
 from app.models.registration_token import RegistrationToken
 from app.models.user import User
 from app.forms.admin import CreateTokenForm, DeactivateTokenForm, DeleteUserForm
+from app.utils import memory_diagnostics
+from app.utils.profiling import list_profiles, profile_path, profile_stats_text, generate_profile_token, PROFILE_HEADER, PROFILE_QUERY_FLAG
 from functools import wraps
+import os
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 
@@ -144,4 +147,105 @@ def delete_user(user_id):
         db.session.rollback()
         flash(f'Fehler beim Löschen des Benutzers: {str(e)}', 'error')
     
-    return redirect(url_for('admin.users'))
\ No newline at end of file
+    return redirect(url_for('admin.users'))
+
+@admin_bp.route('/profiles')
+@login_required
+@admin_required
+def profiles():
+    """List stored request profiles"""
+    return render_template('admin/profiles.html',
+                         profiles=list_profiles(current_app.config['PROFILE_FOLDER']),
+                         profile_token=generate_profile_token(current_app.config['SECRET_KEY']),
+                         profile_header=PROFILE_HEADER,
+                         profile_query_flag=PROFILE_QUERY_FLAG)
+
+@admin_bp.route('/profiles/<filename>')
+@login_required
+@admin_required
+def profile_detail(filename):
+    """Show a stored profile as pstats text"""
+    path = profile_path(current_app.config['PROFILE_FOLDER'], filename)
+    if not path:
+        abort(404)
+    
+    sort_by = request.args.get('sort', 'cumulative')
+    if sort_by not in ('cumulative', 'tottime', 'calls'):
+        sort_by = 'cumulative'
+    
+    return render_template('admin/profile_detail.html',
+                         filename=filename,
+                         sort_by=sort_by,
+                         stats_text=profile_stats_text(path, sort_by))
+
+@admin_bp.route('/profiles/<filename>/download')
+@login_required
+@admin_required
+def download_profile(filename):
+    """Download a stored profile for snakeviz/pstats"""
+    path = profile_path(current_app.config['PROFILE_FOLDER'], filename)
+    if not path:
+        abort(404)
+    return send_file(path, as_attachment=True, download_name=filename, mimetype='application/octet-stream')
+
+@admin_bp.route('/memory')
+@login_required
+@admin_required
+def memory():
+    """Memory diagnostics for the worker handling this request"""
+    folder = current_app.config['MEMORY_SNAPSHOT_FOLDER']
+    key_type = request.args.get('key', 'lineno')
+    if key_type not in ('lineno', 'filename', 'traceback'):
+        key_type = 'lineno'
+    
+    snapshot = request.args.get('snapshot')
+    compare_to = request.args.get('compare_to')
+    allocations = None
+    if snapshot and compare_to:
+        allocations = memory_diagnostics.compare_snapshots(folder, compare_to, snapshot, key_type)
+    elif snapshot:
+        allocations = memory_diagnostics.top_allocations(folder, snapshot, key_type)
+    
+    if snapshot and allocations is None:
+        flash('Snapshot nicht gefunden.', 'error')
+    
+    return render_template('admin/memory.html',
+                         status=memory_diagnostics.tracing_status(),
+                         rss=memory_diagnostics.current_rss_bytes(),
+                         peak_rss=memory_diagnostics.peak_rss_bytes(),
+                         object_counts=memory_diagnostics.object_type_counts(),
+                         snapshots=memory_diagnostics.list_snapshots(folder),
+                         allocations=allocations,
+                         selected_snapshot=snapshot,
+                         compare_to=compare_to,
+                         key_type=key_type)
+
+@admin_bp.route('/memory/tracing', methods=['POST'])
+@login_required
+@admin_required
+def memory_tracing():
+    """Start or stop tracemalloc in this worker"""
+    if request.form.get('action') == 'start':
+        frames = request.form.get('frames', 10, type=int)
+        memory_diagnostics.start_tracing(max(1, min(frames, 50)))
+        flash(f'tracemalloc in Worker {os.getpid()} gestartet.', 'success')
+    else:
+        memory_diagnostics.stop_tracing()
+        flash(f'tracemalloc in Worker {os.getpid()} gestoppt.', 'success')
+    return redirect(url_for('admin.memory'))
+
+@admin_bp.route('/memory/snapshots', methods=['POST'])
+@login_required
+@admin_required
+def memory_snapshot():
+    """Take a tracemalloc snapshot in this worker"""
+    try:
+        filename = memory_diagnostics.take_snapshot(
+            current_app.config['MEMORY_SNAPSHOT_FOLDER'],
+            current_app.config['MEMORY_SNAPSHOT_MAX_FILES']
+        )
+        flash(f'Snapshot {filename} erstellt.', 'success')
+        return redirect(url_for('admin.memory', snapshot=filename))
+    except RuntimeError as e:
+        flash(str(e), 'error')
+        return redirect(url_for('admin.memory'))
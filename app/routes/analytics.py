@@ -0,0 +1,28 @@
+from flask import Blueprint, render_template, request
+from flask_login import login_required, current_user
+from app.utils import analytics
+from app.utils.query_cache import cached_query
+
+analytics_bp = Blueprint('analytics', __name__, url_prefix='/analytics')
+
+@analytics_bp.route('/')
+@login_required
+def index():
+    """Engagement analytics: totals, top posts, hashtag averages and monthly trend"""
+    metric = request.args.get('metric', 'likes')
+    if metric not in analytics.METRICS:
+        metric = 'likes'
+    
+    # Metric captures only change through Post saves, which purge the user's tag
+    def load_analytics():
+        return {
+            'summary': analytics.engagement_summary(current_user.id),
+            'top_posts': analytics.top_posts(current_user.id, metric),
+            'hashtags': analytics.hashtag_averages(current_user.id),
+            'trend': analytics.monthly_trend(current_user.id)
+        }
+    
+    data = cached_query(f'analytics:{current_user.id}:{metric}', [f'user:{current_user.id}'], load_analytics)
+    max_likes = max([month['likes'] for month in data['trend']] or [0])
+    
+    return render_template('analytics/index.html', metric=metric, max_likes=max_likes, **data)
@@ -1,107 +1,91 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request, send_file
+from flask import Blueprint, render_template, redirect, url_for, flash, request, send_file, current_app, abort
 from flask_login import login_required, current_user
 from werkzeug.utils import secure_filename
 import os
-import json
 import zipfile
 import tempfile
 import shutil
+import time
 from datetime import datetime
 from app import db
 from app.models.post import Post
 from app.models.image import Image
+from app.utils.export_jobs import ExportJobManager
+from app.utils.metrics import UPLOAD_BYTES, IMPORT_BYTES, IMPORT_SECONDS
+from app.utils.posts_manifest import iter_archive_posts, MANIFEST_FILENAME, LEGACY_MANIFEST_FILENAME
 
 export_import_bp = Blueprint('export_import', __name__, url_prefix='/export-import')
 
+def _export_jobs():
+    return ExportJobManager(
+        current_app.config['EXPORT_CACHE_FOLDER'],
+        current_app.config['EXPORT_CACHE_TTL'],
+        current_app.config['IMAGE_UPLOAD_FOLDER']
+    )
+
 @export_import_bp.route('/')
 @login_required
 def index():
     """Export/Import dashboard"""
     user_posts_count = Post.query.filter_by(user_id=current_user.id).count()
-    return render_template('export_import/index.html', posts_count=user_posts_count)
+    export_job = _export_jobs().current_job(current_user.id)
+    return render_template('export_import/index.html', posts_count=user_posts_count, export_job=export_job)
 
-@export_import_bp.route('/export')
+@export_import_bp.route('/export', methods=['POST'])
 @login_required
 def export_posts():
-    """Export user's posts as ZIP file"""
+    """Start a background export of the user's posts, reusing a cached archive if nothing changed"""
     try:
-        # Get user's posts
-        posts = Post.query.filter_by(user_id=current_user.id).all()
-        
-        if not posts:
+        if not Post.query.filter_by(user_id=current_user.id).first():
             flash('Sie haben keine Posts zum Exportieren.', 'info')
             return redirect(url_for('export_import.index'))
         
-        # Create temporary directory
-        temp_dir = tempfile.mkdtemp()
-        zip_path = os.path.join(temp_dir, f'posts_export_{current_user.username}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.zip')
-        
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Create posts data structure
-            posts_data = []
-            
-            for post in posts:
-                post_data = {
-                    'id': post.id,
-                    'title': post.title,
-                    'content': post.content,
-                    'hashtags': post.hashtags,
-                    'notes': post.notes,
-                    'status': post.status,
-                    'scheduled_for': getattr(post, 'scheduled_for', None).isoformat() if getattr(post, 'scheduled_for', None) else None,
-                    'created_at': post.created_at.isoformat(),
-                    'updated_at': post.updated_at.isoformat(),
-                    'engagement_stats': getattr(post, 'engagement_stats', None),
-                    'images': []
-                }
-                
-                # Add images
-                for image in post.images:
-                    image_data = {
-                        'filename': image.filename,
-                        'original_filename': getattr(image, 'original_filename', image.filename),
-                        'file_path': getattr(image, 'file_path', ''),
-                        'file_size': getattr(image, 'file_size', 0),
-                        'mime_type': getattr(image, 'mime_type', 'image/jpeg'),
-                        'uploaded_at': image.uploaded_at.isoformat()
-                    }
-                    post_data['images'].append(image_data)
-                    
-                    # Add image file to ZIP
-                    image_path = os.path.join('app/static/uploads/images', image.filename)
-                    if os.path.exists(image_path):
-                        zipf.write(image_path, f'images/{image.filename}')
-                
-                posts_data.append(post_data)
-            
-            # Add posts.json to ZIP
-            posts_json = json.dumps(posts_data, indent=2, ensure_ascii=False)
-            zipf.writestr('posts.json', posts_json)
-            
-            # Add export metadata
-            metadata = {
-                'export_date': datetime.now().isoformat(),
-                'username': current_user.username,
-                'email': current_user.email,
-                'total_posts': len(posts_data),
-                'total_images': sum(len(post['images']) for post in posts_data),
-                'postforge_version': '1.0.0'
-            }
-            zipf.writestr('export_metadata.json', json.dumps(metadata, indent=2))
-        
-        flash(f'✅ {len(posts)} Posts erfolgreich exportiert!', 'success')
+        job = _export_jobs().start_export(current_app._get_current_object(), current_user.id)
         
-        # Send file
-        return send_file(
-            zip_path,
-            as_attachment=True,
-            download_name=os.path.basename(zip_path),
-            mimetype='application/zip'
-        )
+        if job['state'] == 'done':
+            flash('✅ Ihr Export ist bereit zum Herunterladen.', 'success')
+        else:
+            flash('Der Export wird im Hintergrund erstellt.', 'info')
         
     except Exception as e:
         flash(f'❌ Fehler beim Exportieren: {str(e)}', 'error')
-        return redirect(url_for('export_import.index'))
+    
+    return redirect(url_for('export_import.index'))
+
+@export_import_bp.route('/export/<job_id>/status')
+@login_required
+def export_status(job_id):
+    """Progress fragment for a running export (polled by htmx)"""
+    job = _export_jobs().get_job(job_id)
+    if not job or job['user_id'] != current_user.id:
+        abort(404)
+    return render_template('components/export_status.html', export_job=job)
+
+@export_import_bp.route('/export/<job_id>/download')
+@login_required
+def download_export(job_id):
+    """Serve a finished export archive with ETag and Range support"""
+    jobs = _export_jobs()
+    job = jobs.get_job(job_id)
+    if not job or job['user_id'] != current_user.id or job['state'] != 'done':
+        abort(404)
+    
+    artifact_path = jobs.artifact_path(job_id)
+    if not os.path.exists(artifact_path):
+        abort(404)
+    
+    response = send_file(
+        artifact_path,
+        as_attachment=True,
+        download_name=job['filename'],
+        mimetype='application/zip',
+        conditional=True,
+        etag=f"{job_id}-{int(job['finished_at'])}",
+        max_age=0
+    )
+    # Advertise resumable downloads on the initial full response too
+    response.headers['Accept-Ranges'] = 'bytes'
+    return response
 
 @export_import_bp.route('/import', methods=['GET', 'POST'])
 @login_required
@@ -126,29 +110,28 @@ def import_posts():
             return redirect(url_for('export_import.import_posts'))
         
         # Create temporary directory
+        import_start = time.perf_counter()
         temp_dir = tempfile.mkdtemp()
         zip_path = os.path.join(temp_dir, secure_filename(file.filename))
         file.save(zip_path)
+        zip_size = os.path.getsize(zip_path)
+        UPLOAD_BYTES.labels('zip').inc(zip_size)
         
         # Extract ZIP
         extract_dir = os.path.join(temp_dir, 'extracted')
         with zipfile.ZipFile(zip_path, 'r') as zipf:
             zipf.extractall(extract_dir)
         
-        # Read posts.json
-        posts_json_path = os.path.join(extract_dir, 'posts.json')
-        if not os.path.exists(posts_json_path):
-            flash('Ungültige ZIP-Datei: posts.json nicht gefunden.', 'error')
+        # Read the posts manifest line by line (NDJSON, or the legacy posts.json array)
+        if not any(os.path.exists(os.path.join(extract_dir, name)) for name in (MANIFEST_FILENAME, LEGACY_MANIFEST_FILENAME)):
+            flash('Ungültige ZIP-Datei: posts.ndjson/posts.json nicht gefunden.', 'error')
             return redirect(url_for('export_import.import_posts'))
         
-        with open(posts_json_path, 'r', encoding='utf-8') as f:
-            posts_data = json.load(f)
-        
         # Import posts
         imported_posts = 0
         imported_images = 0
         
-        for post_data in posts_data:
+        for post_data in iter_archive_posts(extract_dir):
             # Create new post
             new_post = Post(
                 title=post_data['title'],
@@ -208,6 +191,9 @@ def import_posts():
         # Cleanup
         shutil.rmtree(temp_dir)
         
+        IMPORT_SECONDS.observe(time.perf_counter() - import_start)
+        IMPORT_BYTES.observe(zip_size)
+        
         flash(f'✅ {imported_posts} Posts und {imported_images} Bilder erfolgreich importiert!', 'success')
         return redirect(url_for('posts.index'))
         
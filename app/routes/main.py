@@ -1,8 +1,11 @@
 from flask import Blueprint, render_template, redirect, url_for
 from flask_login import login_required, current_user
+from app import db
 from app.models.post import Post
 from app.models.user import User
-from sqlalchemy import desc
+from app.utils import analytics
+from app.utils.query_cache import cached_query
+from sqlalchemy import desc, func
 
 main_bp = Blueprint('main', __name__)
 
@@ -11,24 +14,44 @@ def index():
     if not current_user.is_authenticated:
         return render_template('main/landing.html')
     
+    # Status counts and the ids of the recent posts are cached per user and
+    # purged whenever one of the user's posts changes
+    def load_dashboard():
+        recent_ids = [post_id for post_id, in db.session.query(Post.id)
+                                                .filter_by(user_id=current_user.id)
+                                                .order_by(desc(Post.created_at))
+                                                .limit(5)]
+        counts = dict(db.session.query(Post.status, func.count(Post.id))
+                                .filter_by(user_id=current_user.id)
+                                .group_by(Post.status))
+        # Chart data comes from the rollup tables: a few rows per user, whatever the library size
+        return {'recent_ids': recent_ids, 'counts': counts,
+                'activity': analytics.monthly_activity(current_user.id),
+                'top_hashtags': analytics.top_hashtags(current_user.id)}
+    
+    dashboard = cached_query(f'dashboard:{current_user.id}', [f'user:{current_user.id}'], load_dashboard)
+    
     # Get recent posts for dashboard
-    recent_posts = Post.query.filter_by(user_id=current_user.id)\
-                            .order_by(desc(Post.created_at))\
-                            .limit(5).all()
+    posts_by_id = {post.id: post for post in Post.query.filter(Post.id.in_(dashboard['recent_ids']))}
+    recent_posts = [posts_by_id[post_id] for post_id in dashboard['recent_ids'] if post_id in posts_by_id]
     
     # Get statistics
-    total_posts = Post.query.filter_by(user_id=current_user.id).count()
-    draft_posts = Post.query.filter_by(user_id=current_user.id, status='draft').count()
-    posted_posts = Post.query.filter_by(user_id=current_user.id, status='posted').count()
-    scheduled_posts = Post.query.filter_by(user_id=current_user.id, status='scheduled').count()
-    
+    counts = dashboard['counts']
     stats = {
-        'total': total_posts,
-        'draft': draft_posts,
-        'posted': posted_posts,
-        'scheduled': scheduled_posts
+        'total': sum(counts.values()),
+        'draft': counts.get('draft', 0),
+        'posted': counts.get('posted', 0),
+        'scheduled': counts.get('scheduled', 0)
     }
     
+    activity = dashboard['activity']
+    top_hashtags = dashboard['top_hashtags']
+    
     return render_template('main/dashboard.html', 
                          recent_posts=recent_posts, 
-                         stats=stats)
\ No newline at end of file
+                         stats=stats,
+                         activity=activity,
+                         max_posts=max([month['posts'] for month in activity] or [0]),
+                         max_likes=max([month['likes'] for month in activity] or [0]),
+                         top_hashtags=top_hashtags,
+                         max_hashtag_posts=max([tag['posts'] for tag in top_hashtags] or [0]))
\ No newline at end of file
@@ -0,0 +1,18 @@
+from flask import Blueprint, abort
+from flask_login import current_user
+from app.utils.media import find_image, send_image
+
+media_bp = Blueprint('media', __name__, url_prefix='/media')
+
+@media_bp.route('/images/<int:image_id>/<path:filename>')
+def image(image_id, filename):
+    """Uploaded image - for the post's owner, or anyone while the post is shared"""
+    row = find_image(image_id, filename)
+    if row is None:
+        abort(404)
+
+    is_owner = current_user.is_authenticated and current_user.id == row.user_id
+    if not (is_owner or row.is_shared):
+        abort(404)
+
+    return send_image(row)
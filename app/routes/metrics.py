@@ -0,0 +1,23 @@
+from flask import Blueprint, Response, request, current_app, abort
+from flask_login import current_user
+import hmac
+from app.utils.metrics import render_metrics
+
+metrics_bp = Blueprint('metrics', __name__)
+
+def _metrics_access_allowed():
+    """Admins, or scrapers presenting METRICS_TOKEN as a bearer token"""
+    token = current_app.config.get('METRICS_TOKEN')
+    auth_header = request.headers.get('Authorization', '')
+    if token and auth_header.startswith('Bearer '):
+        return hmac.compare_digest(auth_header[len('Bearer '):], token)
+    return current_user.is_authenticated and current_user.username == 'admin'
+
+@metrics_bp.route('/metrics')
+def metrics():
+    """Prometheus metrics, aggregated across all workers"""
+    if not _metrics_access_allowed():
+        abort(403)
+
+    payload, content_type = render_metrics()
+    return Response(payload, content_type=content_type)
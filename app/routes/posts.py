@@ -1,9 +1,13 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify
+from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, make_response, abort
 from flask_login import login_required, current_user
 from app import db
 from app.models.post import Post
+from app.models.hashtag import Hashtag, normalize_hashtag
 from app.forms.posts import PostForm, SearchForm
 from app.utils.helpers import flash_errors
+from app.utils.share_cache import share_page_response
+from app.utils.query_cache import cached_query
+from app.utils.hashtag_suggestions import hashtag_suggestions as suggestion_index
 from sqlalchemy import desc, or_
 
 posts_bp = Blueprint('posts', __name__, url_prefix='/posts')
@@ -34,6 +38,11 @@ def index():
     if status_filter != 'all':
         query = query.filter_by(status=status_filter)
     
+    # Apply hashtag filter (exact tag match, served from the hashtag index)
+    tag = normalize_hashtag(request.args.get('tag', ''))
+    if tag:
+        query = query.filter(Post.id.in_(Hashtag.post_ids_for(current_user.id, tag)))
+    
     # Order by creation date
     query = query.order_by(desc(Post.created_at))
     
@@ -44,11 +53,31 @@ def index():
         error_out=False
     )
     
-    return render_template('posts/index.html', 
-                         posts=posts, 
-                         search_form=search_form,
-                         search_query=search_query,
-                         status_filter=status_filter)
+    # htmx filter/search/page requests only need the list; history restores
+    # (back button with an evicted cache) still get the full page
+    is_fragment = (
+        request.headers.get('HX-Request') == 'true'
+        and request.headers.get('HX-Target') == 'posts-container'
+        and request.headers.get('HX-History-Restore-Request') != 'true'
+    )
+    template = 'posts/index_fragment.html' if is_fragment else 'posts/index.html'
+    
+    # Sidebar facets: the user's most used hashtags
+    hashtag_facets = [] if is_fragment else cached_query(
+        f'hashtag_facets:{current_user.id}', [f'user:{current_user.id}'],
+        lambda: Hashtag.top_for_user(current_user.id)
+    )
+    
+    response = make_response(render_template(template, 
+                                             posts=posts, 
+                                             search_form=search_form,
+                                             search_query=search_query,
+                                             status_filter=status_filter,
+                                             tag=tag,
+                                             hashtag_facets=hashtag_facets))
+    # Every header that picks the fragment, so caches never swap page and fragment
+    response.vary.update(('HX-Request', 'HX-Target', 'HX-History-Restore-Request'))
+    return response
 
 @posts_bp.route('/create', methods=['GET', 'POST'])
 @login_required
@@ -168,29 +197,60 @@ def toggle_share(id):
             'message': 'Post für Review freigegeben'
         })
 
+@posts_bp.route('/<int:id>/related')
+@login_required
+def related(id):
+    """The user's posts most similar to this one, for the editor sidebar (htmx fragment)"""
+    from app.utils.related_posts import related_posts_index
+    post = Post.query.filter_by(id=id, user_id=current_user.id).first_or_404()
+    
+    matches = related_posts_index.related(current_user.id, post)
+    posts_by_id = {p.id: p for p in Post.query.filter(Post.id.in_([post_id for post_id, _ in matches]))}
+    related_posts = [(posts_by_id[post_id], score) for post_id, score in matches if post_id in posts_by_id]
+    
+    return render_template('components/related_posts.html', related_posts=related_posts)
+
 @posts_bp.route('/shared/<token>')
 def public_view(token):
     """Public view for shared posts - no login required"""
-    post = Post.query.filter_by(share_token=token, is_shared=True).first_or_404()
-    return render_template('posts/public_view.html', post=post)
+    return share_page_response(token)
 
 @posts_bp.route('/<int:id>/images')
 @login_required
 def get_post_images(id):
-    post = Post.query.filter_by(id=id, user_id=current_user.id).first_or_404()
+    def load_images():
+        post = Post.query.filter_by(id=id, user_id=current_user.id).first()
+        if post is None:
+            return None
+        
+        images_data = []
+        for image in post.images:
+            images_data.append({
+                'id': image.id,
+                'filename': image.filename,
+                'original_filename': image.original_filename,
+                'file_size': image.file_size,
+                'mime_type': image.mime_type,
+                'url': url_for('media.image', image_id=image.id, filename=image.filename)
+            })
+        return images_data
     
-    images_data = []
-    for image in post.images:
-        images_data.append({
-            'id': image.id,
-            'filename': image.filename,
-            'original_filename': image.original_filename,
-            'file_size': image.file_size,
-            'mime_type': image.mime_type
-        })
+    # Keyed by owner as well, so a hit implies the ownership check passed
+    images_data = cached_query(f'images:{current_user.id}:{id}', [f'post:{id}'], load_images)
+    if images_data is None:
+        abort(404)
     
     return jsonify(images_data)
 
+@posts_bp.route('/hashtags/suggest')
+@login_required
+def hashtag_suggestions():
+    """Autocomplete for the hashtags field, ranked by how often and how recently a tag was used"""
+    prefix = request.args.get('q', '')
+    if not prefix.lstrip('#'):
+        return jsonify([])
+    return jsonify(suggestion_index.suggest(current_user.id, prefix))
+
 @posts_bp.route('/search')
 @login_required
 def search():
@@ -198,18 +258,21 @@ def search():
     if not query:
         return jsonify([])
     
-    posts = Post.query.filter_by(user_id=current_user.id)\
-                     .filter(
-                         or_(
-                             Post.title.contains(query),
-                             Post.content.contains(query),
-                             Post.hashtags.contains(query)
-                         )
-                     ).limit(10).all()
-    
-    return jsonify([{
-        'id': post.id,
-        'title': post.title,
-        'content': post.content[:100] + '...' if len(post.content) > 100 else post.content,
-        'status': post.status_display
-    } for post in posts])
\ No newline at end of file
+    def load_suggestions():
+        posts = Post.query.filter_by(user_id=current_user.id)\
+                         .filter(
+                             or_(
+                                 Post.title.contains(query),
+                                 Post.content.contains(query),
+                                 Post.hashtags.contains(query)
+                             )
+                         ).limit(10).all()
+        
+        return [{
+            'id': post.id,
+            'title': post.title,
+            'content': post.content[:100] + '...' if len(post.content) > 100 else post.content,
+            'status': post.status_display
+        } for post in posts]
+    
+    return jsonify(cached_query(f'search:{current_user.id}:{query}', [f'user:{current_user.id}'], load_suggestions))
\ No newline at end of file
@@ -5,10 +5,10 @@ from app import db, csrf
 from app.models.post import Post
 from app.models.image import Image
 from app.forms.posts import PDFUploadForm, ImageUploadForm
-from app.utils.pdf_parser import LinkedInPDFParser
-from app.utils.image_processor import ImageProcessor
 from app.utils.helpers import flash_errors
+from app.utils.metrics import UPLOAD_BYTES, PDF_PARSE_SECONDS, PDF_PAGES
 import os
+import time
 import uuid
 
 upload_bp = Blueprint('upload', __name__, url_prefix='/upload')
@@ -29,12 +29,17 @@ def import_pdf():
         try:
             # Check file size
             file_size = os.path.getsize(filepath)
+            UPLOAD_BYTES.labels('pdf').inc(file_size)
             if file_size > 10 * 1024 * 1024:  # 10MB limit
                 raise ValueError("PDF-Datei ist zu groß (max. 10MB)")
             
-            # Parse PDF with timeout protection
+            # Parse PDF with timeout protection (parser libraries are loaded on first use)
+            from app.utils.pdf_parser import LinkedInPDFParser
             parser = LinkedInPDFParser()
+            parse_start = time.perf_counter()
             posts_data = parser.parse_pdf(filepath)
+            PDF_PARSE_SECONDS.observe(time.perf_counter() - parse_start)
+            PDF_PAGES.observe(parser.page_count)
             
             # Store parsed data in session for preview
             from flask import session
@@ -65,9 +70,18 @@ def preview_import():
         flash('Keine Posts zum Importieren gefunden.', 'warning')
         return redirect(url_for('upload.import_pdf'))
     
+    # Flag posts that nearly duplicate ones already in the library
+    from app.models.post_signature import find_near_duplicates
+    matches = find_near_duplicates(current_user.id, [post.get('content', '') for post in posts_data])
+    matched_ids = {post_id for post_matches in matches for post_id, _ in post_matches}
+    posts_by_id = {post.id: post for post in Post.query.filter(Post.id.in_(matched_ids))} if matched_ids else {}
+    duplicates = [[(posts_by_id[post_id], score) for post_id, score in post_matches if post_id in posts_by_id]
+                  for post_matches in matches]
+    
     return render_template('upload/preview.html', 
                          posts_data=posts_data, 
-                         pdf_filename=pdf_filename)
+                         pdf_filename=pdf_filename,
+                         duplicates=duplicates)
 
 @upload_bp.route('/confirm-import', methods=['POST'])
 @login_required
@@ -127,6 +141,7 @@ def upload_images():
         if not post:
             return jsonify({'error': 'Post nicht gefunden'}), 404
     
+    from app.utils.image_processor import ImageProcessor
     processor = ImageProcessor(current_app.config['IMAGE_UPLOAD_FOLDER'])
     uploaded_images = []
     
@@ -134,6 +149,7 @@ def upload_images():
         if file and file.filename:
             try:
                 image_data = processor.process_image(file)
+                UPLOAD_BYTES.labels('image').inc(image_data['file_size'])
                 
                 # Save to database if post_id is provided
                 if post_id:
@@ -186,6 +202,7 @@ def delete_image(image_id):
     
     try:
         # Delete file from filesystem
+        from app.utils.image_processor import ImageProcessor
         processor = ImageProcessor(current_app.config['IMAGE_UPLOAD_FOLDER'])
         processor.delete_image(image.file_path)
         
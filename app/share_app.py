@@ -0,0 +1,78 @@
+"""
+Standalone server for public share pages
+Serves only /posts/shared/<token>, the images of shared posts and static
+files, so review links can be scaled separately from the main app. It
+reuses the Post model, public_view.html and the share-page cache, but does
+not set up Flask-Login, CSRF, Babel, migrations or the PDF/imaging code, and
+its database connections are read-only.
+
+    gunicorn --workers 4 --bind 0.0.0.0:5001 share_wsgi:app
+"""
+
+from flask import Blueprint, Flask, abort
+from app import db
+from app.models import Post, Image  # noqa: F401 - registers the mappers
+from app.utils.media import find_image, send_image
+from app.utils.share_cache import share_page_cache, share_page_response
+from app.utils.sqlite_pragmas import engine_options
+
+# Blueprint names match the main app so url_for() in shared templates resolves
+share_bp = Blueprint('posts', __name__, url_prefix='/posts')
+media_bp = Blueprint('media', __name__, url_prefix='/media')
+
+
+@share_bp.route('/shared/<token>')
+def public_view(token):
+    return share_page_response(token)
+
+
+@media_bp.route('/images/<int:image_id>/<path:filename>')
+def image(image_id, filename):
+    """Images of shared posts only; there are no logged-in users here"""
+    row = find_image(image_id, filename)
+    if row is None or not row.is_shared:
+        abort(404)
+    return send_image(row)
+
+
+def _read_only_engine_options(uri, options):
+    options = dict(options or {})
+    if uri.startswith('postgresql'):
+        connect_args = dict(options.get('connect_args', {}))
+        connect_args['options'] = f"{connect_args.get('options', '')} -c default_transaction_read_only=on".strip()
+        options['connect_args'] = connect_args
+    return options
+
+
+def create_share_app(config_name='production'):
+    from config import config
+    app = Flask(__name__)
+    app.config.from_object(config[config_name])
+
+    # Optionally read from a replica; the schema is owned by the main app
+    if app.config.get('SHARE_DATABASE_URL'):
+        app.config['SQLALCHEMY_DATABASE_URI'] = app.config['SHARE_DATABASE_URL']
+    uri = app.config['SQLALCHEMY_DATABASE_URI']
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = _read_only_engine_options(
+        uri, engine_options(uri, app.config.get('SQLALCHEMY_ENGINE_OPTIONS'))
+    )
+
+    db.init_app(app)
+    with app.app_context():
+        from app.utils.sqlite_pragmas import register_sqlite_pragmas
+        pragmas = dict(app.config.get('SQLITE_PRAGMAS') or {}, query_only='ON')
+        pragmas.pop('journal_mode', None)  # changing it would need a write
+        register_sqlite_pragmas(db.engine, pragmas)
+
+    share_page_cache.max_entries = app.config['SHARE_CACHE_MAX_ENTRIES']
+
+    from app.utils.compression import init_compression
+    from app.utils.media import init_media
+    from app.utils.static_assets import init_static_assets
+    init_compression(app)
+    init_media(app)
+    init_static_assets(app)
+
+    app.register_blueprint(share_bp)
+    app.register_blueprint(media_bp)
+    return app
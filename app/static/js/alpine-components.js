@@ -176,6 +176,64 @@ function searchComponent() {
     }
 }
 
+// Hashtag Autocomplete Component (wraps the hashtags input, which has x-ref="input")
+function hashtagAutocomplete(url) {
+    return {
+        items: [],
+        open: false,
+        active: 0,
+        
+        currentWord() {
+            const input = this.$refs.input;
+            const match = input.value.slice(0, input.selectionStart).match(/#?([\p{L}\p{N}_]*)$/u);
+            return match ? match[0] : '';
+        },
+        
+        update() {
+            const word = this.currentWord().replace(/^#/, '');
+            if (!word) {
+                this.close();
+                return;
+            }
+            
+            fetch(`${url}?q=${encodeURIComponent(word)}`)
+                .then(response => response.json())
+                .then(data => {
+                    // Don't suggest tags that are already in the field
+                    const used = new Set(this.$refs.input.value.toLowerCase().match(/[\p{L}\p{N}_]+/gu) || []);
+                    used.delete(word.toLowerCase());
+                    this.items = data.filter(item => !used.has(item.name));
+                    this.active = 0;
+                    this.open = this.items.length > 0;
+                });
+        },
+        
+        move(step) {
+            if (!this.open) return;
+            this.active = (this.active + step + this.items.length) % this.items.length;
+        },
+        
+        choose(index) {
+            const item = this.items[index];
+            if (!item) return;
+            
+            const input = this.$refs.input;
+            const cursor = input.selectionStart;
+            const start = cursor - this.currentWord().length;
+            const tag = `#${item.name} `;
+            input.value = input.value.slice(0, start) + tag + input.value.slice(cursor).replace(/^\S*\s?/, '');
+            input.setSelectionRange(start + tag.length, start + tag.length);
+            input.dispatchEvent(new Event('input'));
+            this.close();
+        },
+        
+        close() {
+            this.open = false;
+            this.items = [];
+        }
+    }
+}
+
 // Notification Component
 function notificationComponent() {
     return {
@@ -286,7 +344,7 @@ window.loadImagesForDownload = function(postId) {
                 imageDiv.className = 'flex items-center justify-between p-3 border border-gray-200 rounded';
                 imageDiv.innerHTML = `
                     <div class="flex items-center space-x-3">
-                        <img src="/static/uploads/images/${image.filename}" 
+                        <img src="${image.url}" 
                              alt="${image.original_filename}" 
                              class="w-12 h-12 object-cover rounded">
                         <div>
@@ -294,7 +352,7 @@ window.loadImagesForDownload = function(postId) {
                             <p class="text-sm text-gray-500">${formatFileSize(image.file_size)}</p>
                         </div>
                     </div>
-                    <a href="/static/uploads/images/${image.filename}" 
+                    <a href="${image.url}" 
                        download="${image.original_filename}"
                        class="btn-secondary text-sm">
                         Herunterladen
@@ -346,5 +404,6 @@ document.addEventListener('alpine:init', () => {
     Alpine.data('pdfUpload', pdfUpload);
     Alpine.data('imageUpload', imageUpload);
     Alpine.data('searchComponent', searchComponent);
+    Alpine.data('hashtagAutocomplete', hashtagAutocomplete);
     Alpine.data('notificationComponent', notificationComponent);
 });
\ No newline at end of file
@@ -1,7 +1,20 @@
-from .pdf_parser import LinkedInPDFParser
-from .image_processor import ImageProcessor
 from .helpers import *
 
+# The PDF parser and image processor pull in PyPDF2/pdfplumber and Pillow;
+# they are only imported on first access so workers that never handle an
+# upload don't pay for them
+_LAZY_IMPORTS = {
+    'LinkedInPDFParser': '.pdf_parser',
+    'ImageProcessor': '.image_processor'
+}
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        import importlib
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 __all__ = [
     'LinkedInPDFParser',
     'ImageProcessor',
@@ -12,4 +25,4 @@ __all__ = [
     'truncate_text',
     'get_post_status_badge_class',
     'admin_required'
-]
\ No newline at end of file
+]
@@ -0,0 +1,105 @@
+"""
+Engagement analytics
+Totals, hashtag and monthly figures are read from the per-user rollup tables
+(app/models/analytics_rollup.py), so their cost does not grow with the size
+of the library; only top_posts reads post_metrics, through
+idx_post_metrics_user_latest.
+"""
+
+from datetime import date
+from sqlalchemy import func
+from app import db
+from app.models.analytics_rollup import user_hashtag_rollups, user_monthly_rollups
+from app.models.hashtag import Hashtag
+from app.models.post import Post
+from app.models.post_metric import PostMetric
+
+METRICS = ('likes', 'comments', 'impressions')
+
+
+def _latest(user_id):
+    return db.session.query(PostMetric).filter(PostMetric.user_id == user_id, PostMetric.is_latest.is_(True))
+
+
+def _average(total, count):
+    return total / count if count else 0.0
+
+
+def engagement_summary(user_id):
+    rollups = user_monthly_rollups.c
+    row = db.session.query(
+        func.coalesce(func.sum(rollups.measured_posts), 0),
+        func.coalesce(func.sum(rollups.likes), 0),
+        func.coalesce(func.sum(rollups.comments), 0),
+        func.coalesce(func.sum(rollups.impressions), 0),
+        func.coalesce(func.sum(rollups.impression_posts), 0)
+    ).filter(rollups.user_id == user_id).one()
+    posts, likes, comments, impressions, impression_posts = (int(value) for value in row)
+    return {
+        'posts': posts,
+        'likes': likes, 'comments': comments, 'impressions': impressions,
+        'avg_likes': _average(likes, posts), 'avg_comments': _average(comments, posts),
+        'avg_impressions': _average(impressions, impression_posts)
+    }
+
+
+def top_posts(user_id, metric='likes', limit=10):
+    """[{id, title, created_at, likes, comments, impressions}] ordered by ``metric``"""
+    column = getattr(PostMetric, metric if metric in METRICS else 'likes')
+    rows = _latest(user_id).join(Post, Post.id == PostMetric.post_id).with_entities(
+        Post.id, Post.title, Post.created_at, PostMetric.likes, PostMetric.comments, PostMetric.impressions
+    ).filter(column.isnot(None)).order_by(column.desc(), Post.created_at.desc()).limit(limit)
+    return [row._asdict() for row in rows]
+
+
+def hashtag_averages(user_id, limit=15, min_posts=2):
+    """[{name, posts, avg_likes, avg_comments}] for hashtags used on at least ``min_posts`` measured posts"""
+    rollups = user_hashtag_rollups.c
+    avg_likes = rollups.likes * 1.0 / rollups.measured_posts
+    rows = db.session.query(Hashtag.name, rollups.measured_posts, rollups.likes, rollups.comments)\
+        .join(user_hashtag_rollups, rollups.hashtag_id == Hashtag.id)\
+        .filter(rollups.user_id == user_id, rollups.measured_posts >= max(min_posts, 1))\
+        .order_by(avg_likes.desc(), Hashtag.name)\
+        .limit(limit)
+    return [{'name': name, 'posts': posts, 'avg_likes': _average(likes, posts), 'avg_comments': _average(comments, posts)}
+            for name, posts, likes, comments in rows]
+
+
+def monthly_trend(user_id, months=12):
+    """[{month, posts, likes, comments}] for the last ``months`` months with measured posts, oldest first"""
+    rollups = user_monthly_rollups.c
+    rows = db.session.query(rollups.month, rollups.measured_posts, rollups.likes, rollups.comments)\
+        .filter(rollups.user_id == user_id, rollups.measured_posts > 0)\
+        .order_by(rollups.month.desc())\
+        .limit(months)
+    return [{'month': month, 'posts': posts, 'likes': likes, 'comments': comments}
+            for month, posts, likes, comments in reversed(rows.all())]
+
+
+def _month_keys(months, today=None):
+    """'YYYY-MM' of the last ``months`` calendar months, oldest first"""
+    today = today or date.today()
+    index = today.year * 12 + today.month - 1
+    return [f'{i // 12:04d}-{i % 12 + 1:02d}' for i in range(index - months + 1, index + 1)]
+
+
+def monthly_activity(user_id, months=12):
+    """[{month, posts, likes, comments}] for each of the last ``months`` calendar months, oldest first"""
+    keys = _month_keys(months)
+    rollups = user_monthly_rollups.c
+    rows = {month: (posts, likes, comments) for month, posts, likes, comments in db.session.query(
+        rollups.month, rollups.posts, rollups.likes, rollups.comments
+    ).filter(rollups.user_id == user_id, rollups.month >= keys[0], rollups.month <= keys[-1])}
+    return [dict(zip(('month', 'posts', 'likes', 'comments'), (month,) + rows.get(month, (0, 0, 0))))
+            for month in keys]
+
+
+def top_hashtags(user_id, limit=8):
+    """[{name, posts, likes}] of the user's most used hashtags"""
+    rollups = user_hashtag_rollups.c
+    rows = db.session.query(Hashtag.name, rollups.posts, rollups.likes)\
+        .join(user_hashtag_rollups, rollups.hashtag_id == Hashtag.id)\
+        .filter(rollups.user_id == user_id)\
+        .order_by(rollups.posts.desc(), Hashtag.name)\
+        .limit(limit)
+    return [{'name': name, 'posts': posts, 'likes': likes} for name, posts, likes in rows]
@@ -0,0 +1,54 @@
+"""
+Application bootstrapping for PostForge
+Runs database migrations and creates the default admin user; shared by the
+development server (app.py) and the production WSGI entrypoint (wsgi.py)
+"""
+
+import os
+import secrets
+import string
+from app import db
+
+
+def bootstrap_application():
+    """Prepare the database for serving requests (call inside an app context)"""
+    from app.models import User
+    from app.utils.database_migrations import run_migrations, verify_database_schema
+
+    # Run automatic database migrations
+    if run_migrations():
+        print("✅ Database migrations completed successfully")
+    else:
+        print("❌ Database migrations failed")
+        return False
+
+    # Verify database schema (optional - don't fail if verification has issues)
+    try:
+        if verify_database_schema():
+            print("✅ Database schema verification completed")
+        else:
+            print("⚠️  Database schema verification had issues, but continuing...")
+    except Exception as e:
+        print(f"⚠️  Database schema verification failed: {e}, but continuing...")
+
+    # Create a default user if none exists
+    if not User.query.first():
+        # Get admin password from environment or generate random one
+        admin_password = os.getenv('ADMIN_PASSWORD')
+        if not admin_password:
+            # Generate random password: 12 characters with letters, digits, and symbols
+            admin_password = ''.join(secrets.choice(string.ascii_letters + string.digits + '!@#$%^&*') for _ in range(12))
+            print(f"🔐 Generated admin password: {admin_password}")
+        else:
+            print("🔐 Using provided admin password")
+
+        default_user = User(
+            username='admin',
+            email='admin@postforge.local'
+        )
+        default_user.set_password(admin_password)
+        db.session.add(default_user)
+        db.session.commit()
+        print("✅ Default admin user created: admin / (password shown above)")
+
+    return True
@@ -0,0 +1,169 @@
+"""
+Response compression.
+
+Dynamic responses (HTML pages, htmx fragments, JSON) are gzip- or
+Brotli-compressed in an ``after_request`` hook, negotiated on
+``Accept-Encoding``. Static assets are not compressed per request: the
+``compress_static.py`` build step writes ``.br``/``.gz`` siblings next to
+them, and the static view serves those directly when the client accepts
+them and the variant is not older than the source file.
+"""
+import gzip
+import mimetypes
+import os
+
+from flask import request, send_from_directory
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; fall back to gzip only
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/javascript',
+    'application/json',
+    'application/xml',
+    'image/svg+xml',
+    'text/css',
+    'text/csv',
+    'text/html',
+    'text/javascript',
+    'text/plain',
+    'text/xml',
+}
+
+# File extension -> Content-Encoding, in order of preference
+PRECOMPRESSED_SUFFIXES = (('.br', 'br'), ('.gz', 'gzip'))
+
+
+def available_encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate_encoding(accept_encodings, offered):
+    """Pick the best of ``offered`` for the request's Accept-Encoding.
+
+    The highest q-value wins; on a tie the earlier entry in ``offered``
+    (Brotli before gzip) is preferred. Returns None for identity.
+    """
+    best, best_quality = None, 0
+    for encoding in offered:
+        quality = accept_encodings.quality(encoding)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def if_none_match(etag):
+    """True if the request's If-None-Match matches ``etag`` in any encoding.
+
+    Compressed responses carry ``<etag>-br``/``<etag>-gzip`` (see
+    ``compress_response``), so views that check validators themselves must
+    accept those variants as well.
+    """
+    candidates = request.if_none_match
+    if candidates.star_tag:
+        return True
+    for value in candidates.as_set():
+        for _, encoding in PRECOMPRESSED_SUFFIXES:
+            if value.endswith(f'-{encoding}'):
+                value = value[:-len(encoding) - 1]
+                break
+        if value == etag:
+            return True
+    return False
+
+
+def compress(data, encoding, gzip_level=6, brotli_quality=5):
+    if encoding == 'br':
+        return brotli.compress(data, quality=brotli_quality)
+    return gzip.compress(data, compresslevel=gzip_level, mtime=0)
+
+
+def _add_vary(response):
+    if 'accept-encoding' not in (v.lower() for v in response.vary):
+        response.vary.add('Accept-Encoding')
+
+
+def _should_compress(response, min_size):
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return False
+    if response.direct_passthrough or response.is_streamed:
+        return False  # send_file() responses and generators stream as-is
+    if 'Content-Encoding' in response.headers:
+        return False
+    if 'no-transform' in response.headers.get('Cache-Control', ''):
+        return False
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return False  # images, ZIPs, PDFs are already compressed
+    return response.content_length is None or response.content_length >= min_size
+
+
+def init_compression(app):
+    """Compress dynamic responses and serve precompressed static files."""
+    if not app.config.get('COMPRESSION_ENABLED', True):
+        return
+
+    min_size = app.config.get('COMPRESSION_MIN_SIZE', 500)
+    gzip_level = app.config.get('COMPRESSION_GZIP_LEVEL', 6)
+    brotli_quality = app.config.get('COMPRESSION_BROTLI_QUALITY', 5)
+
+    @app.after_request
+    def compress_response(response):
+        if request.method == 'HEAD' or not _should_compress(response, min_size):
+            return response
+
+        # The body may be compressible but too small; either way caches must
+        # key on Accept-Encoding once we might vary the representation
+        _add_vary(response)
+        encoding = negotiate_encoding(request.accept_encodings, available_encodings())
+        data = response.get_data()
+        if encoding is None or len(data) < min_size:
+            return response
+
+        response.set_data(compress(data, encoding, gzip_level, brotli_quality))
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag:
+            # A different byte representation needs a different strong ETag
+            response.set_etag(f'{etag}-{encoding}', weak=weak)
+        return response
+
+    static_view = app.view_functions.get('static')
+    if static_view is None or not app.static_folder:
+        return
+
+    def precompressed_static(filename):
+        return _send_precompressed(app, filename, static_view)
+
+    app.view_functions['static'] = precompressed_static
+
+
+def _send_precompressed(app, filename, static_view):
+    """Serve ``filename.br``/``filename.gz`` if present, fresh and accepted."""
+    source = safe_join(app.static_folder, filename)
+    if source is None or not os.path.isfile(source):
+        return static_view(filename=filename)
+    source_mtime = os.path.getmtime(source)
+
+    variants = {}
+    for suffix, encoding in PRECOMPRESSED_SUFFIXES:
+        path = source + suffix
+        if os.path.isfile(path) and os.path.getmtime(path) >= source_mtime:
+            variants[encoding] = filename + suffix
+    if not variants:
+        return static_view(filename=filename)
+
+    encoding = negotiate_encoding(request.accept_encodings, list(variants))
+    if encoding is None:
+        response = static_view(filename=filename)
+    else:
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        response = send_from_directory(
+            app.static_folder, variants[encoding],
+            mimetype=mimetype, max_age=app.get_send_file_max_age(filename)
+        )
+        response.headers['Content-Encoding'] = encoding
+    _add_vary(response)
+    return response
@@ -56,7 +56,7 @@ def run_migrations():
         # Create all tables (this will create the database file if it doesn't exist)
         try:
             # Import models to ensure they're registered
-            from app.models import User, Post, Image, RegistrationToken
+            from app.models import User, Post, Image, RegistrationToken, Hashtag, PostMetric
             
             db.create_all()
             print("✅ Database tables created/verified")
@@ -142,6 +142,34 @@ def run_migrations():
                         migrations_applied += 1
                         print("✅ Added mime_type column")
                     
+                    # Index hashtags of posts written before the hashtags table existed
+                    from app.models.hashtag import backfill_hashtags
+                    backfilled = backfill_hashtags(connection)
+                    if backfilled:
+                        migrations_applied += 1
+                        print(f"✅ Indexed hashtags of {backfilled} existing posts")
+                    
+                    # MinHash signatures for near-duplicate detection on import
+                    from app.models.post_signature import backfill_signatures
+                    signed = backfill_signatures(connection)
+                    if signed:
+                        migrations_applied += 1
+                        print(f"✅ Computed duplicate-detection signatures for {signed} existing posts")
+                    
+                    # Numeric engagement metrics parsed from the engagement_stats strings
+                    from app.models.post_metric import backfill_metrics
+                    captured = backfill_metrics(connection)
+                    if captured:
+                        migrations_applied += 1
+                        print(f"✅ Parsed engagement metrics of {captured} existing posts")
+                    
+                    # Analytics rollups; the backfills above bypass their events
+                    from app.models.analytics_rollup import rebuild_rollups, rollups_missing
+                    if backfilled or captured or rollups_missing(connection):
+                        months, tags = rebuild_rollups(connection)
+                        migrations_applied += 1
+                        print(f"✅ Rebuilt analytics rollups ({months} months, {tags} hashtags)")
+                    
                     # Commit all migrations
                     trans.commit()
                     print("✅ All migrations committed successfully")
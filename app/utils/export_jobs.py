@@ -0,0 +1,259 @@
+"""
+Background export jobs for PostForge
+Builds export archives outside the request cycle and keeps them on disk
+for a configurable TTL so unchanged libraries reuse the cached artifact
+"""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from datetime import datetime
+from typing import Dict, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
+from app import db
+from app.models.post import Post
+from app.models.image import Image
+from app.models.user import User
+from app.utils.metrics import EXPORT_BYTES, EXPORT_SECONDS
+from app.utils.posts_manifest import ManifestWriter, serialize_post, MANIFEST_FILENAME, MANIFEST_VERSION
+
+# Jobs whose status file has not been touched for this long are treated as
+# abandoned (e.g. the worker running them was restarted) and may be restarted
+STALE_JOB_SECONDS = 10 * 60
+
+_start_lock = threading.Lock()
+
+
+def export_fingerprint(user_id: int) -> str:
+    """Fingerprint of everything that ends up in a user's export archive"""
+    post_count, max_post_id, max_updated_at = db.session.query(
+        func.count(Post.id), func.max(Post.id), func.max(Post.updated_at)
+    ).filter(Post.user_id == user_id).one()
+
+    image_count, max_image_id = db.session.query(
+        func.count(Image.id), func.max(Image.id)
+    ).join(Post).filter(Post.user_id == user_id).one()
+
+    # The archive's metadata and filename carry the profile fields
+    username, email = db.session.query(User.username, User.email).filter(User.id == user_id).one()
+
+    raw = f"{user_id}:{username}:{email}:{post_count}:{max_post_id}:{max_updated_at}:{image_count}:{max_image_id}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]
+
+
+class ExportJobManager:
+    def __init__(self, cache_folder: str, ttl: int, image_folder: str):
+        self.cache_folder = cache_folder
+        self.ttl = ttl
+        self.image_folder = image_folder
+        os.makedirs(self.cache_folder, exist_ok=True)
+
+    def status_path(self, job_id: str) -> str:
+        return os.path.join(self.cache_folder, f"{job_id}.json")
+
+    def artifact_path(self, job_id: str) -> str:
+        return os.path.join(self.cache_folder, f"{job_id}.zip")
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Load job status, or None if the job is unknown or expired"""
+        try:
+            with open(self.status_path(job_id), 'r', encoding='utf-8') as f:
+                job = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if self._is_expired(job):
+            self._remove(job_id)
+            return None
+        return job
+
+    def current_job(self, user_id: int) -> Optional[Dict]:
+        """Job matching the user's current data, if one exists"""
+        return self.get_job(export_fingerprint(user_id))
+
+    def start_export(self, app, user_id: int) -> Dict:
+        """Start a background export, reusing a running or finished job for unchanged data"""
+        self.cleanup_expired()
+        job_id = export_fingerprint(user_id)
+
+        with _start_lock:
+            existing = self.get_job(job_id)
+            if existing and existing['state'] in ('pending', 'running', 'done'):
+                return existing
+
+            job = {
+                'id': job_id,
+                'user_id': user_id,
+                'state': 'pending',
+                'progress': 0,
+                'processed_posts': 0,
+                'total_posts': 0,
+                'created_at': time.time(),
+                'finished_at': None,
+                'filename': None,
+                'size': 0,
+                'error': None
+            }
+
+            if existing:
+                # Retry of a failed job
+                self._save(job)
+            else:
+                # Claim the job across workers; the status file is the lock
+                for _ in range(3):
+                    if self._claim(job):
+                        break
+                    claimed = self.get_job(job_id)
+                    if claimed:
+                        return claimed
+                    # get_job() dropped an expired job; claim it again
+                else:
+                    raise RuntimeError(f'Exportstatus {job_id} ist nicht lesbar')
+
+        thread = threading.Thread(target=self._run, args=(app, job), daemon=True)
+        thread.start()
+        return job
+
+    def cleanup_expired(self) -> int:
+        """Remove expired artifacts and abandoned status files"""
+        removed = 0
+        try:
+            entries = os.listdir(self.cache_folder)
+        except OSError:
+            return 0
+
+        for entry in entries:
+            if not entry.endswith('.json'):
+                continue
+            job_id = entry[:-len('.json')]
+            if self.get_job(job_id) is None:
+                self._remove(job_id)
+                removed += 1
+        return removed
+
+    def _run(self, app, job: Dict):
+        with app.app_context():
+            try:
+                user = db.session.get(User, job['user_id'])
+                job['state'] = 'running'
+                job['total_posts'] = Post.query.filter_by(user_id=user.id).count()
+                self._save(job)
+
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                part_path = self.artifact_path(job['id']) + '.part'
+                self._build_archive(part_path, user, job)
+                os.replace(part_path, self.artifact_path(job['id']))
+
+                job['state'] = 'done'
+                job['progress'] = 100
+                job['finished_at'] = time.time()
+                job['filename'] = f'posts_export_{user.username}_{timestamp}.zip'
+                job['size'] = os.path.getsize(self.artifact_path(job['id']))
+                self._save(job)
+
+                EXPORT_SECONDS.observe(job['finished_at'] - job['created_at'])
+                EXPORT_BYTES.observe(job['size'])
+            except Exception as e:
+                job['state'] = 'failed'
+                job['error'] = str(e)
+                job['finished_at'] = time.time()
+                self._save(job)
+                part_path = self.artifact_path(job['id']) + '.part'
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+            finally:
+                db.session.remove()
+
+    def _build_archive(self, zip_path: str, user: User, job: Dict):
+        # Images are loaded per batch of 100 posts instead of one query per post
+        posts = Post.query.filter_by(user_id=user.id).order_by(Post.id)\
+            .options(selectinload(Post.images)).yield_per(100)
+        last_save = time.time()
+        total_images = 0
+
+        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf, \
+                tempfile.TemporaryFile('w+', encoding='utf-8') as manifest_file:
+            # Images go into the archive as we go; the manifest is spooled to
+            # disk because a ZIP can only have one member open for writing
+            manifest = ManifestWriter(manifest_file)
+
+            for post in posts:
+                record = serialize_post(post)
+                manifest.write(record)
+
+                for image_data in record['images']:
+                    image_path = os.path.join(self.image_folder, image_data['filename'])
+                    if os.path.exists(image_path):
+                        zipf.write(image_path, f"images/{image_data['filename']}")
+                total_images += len(record['images'])
+
+                job['processed_posts'] += 1
+                if time.time() - last_save >= 1:
+                    job['progress'] = int(job['processed_posts'] * 99 / max(job['total_posts'], 1))
+                    self._save(job)
+                    last_save = time.time()
+
+            manifest_file.seek(0)
+            with zipf.open(MANIFEST_FILENAME, 'w') as member:
+                with io.TextIOWrapper(member, encoding='utf-8') as member_text:
+                    shutil.copyfileobj(manifest_file, member_text)
+
+            metadata = {
+                'export_date': datetime.now().isoformat(),
+                'username': user.username,
+                'email': user.email,
+                'total_posts': manifest.count,
+                'total_images': total_images,
+                'manifest': MANIFEST_FILENAME,
+                'manifest_version': MANIFEST_VERSION,
+                'postforge_version': '1.0.0'
+            }
+            zipf.writestr('export_metadata.json', json.dumps(metadata, indent=2))
+
+    def _is_expired(self, job: Dict) -> bool:
+        now = time.time()
+        if job['state'] in ('done', 'failed'):
+            return now - (job.get('finished_at') or job['created_at']) > self.ttl
+        # Pending/running jobs expire when their worker stops reporting progress
+        try:
+            last_update = os.path.getmtime(self.status_path(job['id']))
+        except OSError:
+            return True
+        return now - last_update > STALE_JOB_SECONDS
+
+    def _claim(self, job: Dict) -> bool:
+        """Create the job's status file unless it exists; False if another worker got there first.
+
+        The file is written under a temporary name and linked into place, so
+        other workers never see it empty or half written.
+        """
+        tmp_path = f"{self.status_path(job['id'])}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(job, f)
+        try:
+            os.link(tmp_path, self.status_path(job['id']))
+            return True
+        except FileExistsError:
+            return False
+        finally:
+            os.remove(tmp_path)
+
+    def _save(self, job: Dict):
+        tmp_path = self.status_path(job['id']) + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(job, f)
+        os.replace(tmp_path, self.status_path(job['id']))
+
+    def _remove(self, job_id: str):
+        for path in (self.status_path(job_id), self.artifact_path(job_id), self.artifact_path(job_id) + '.part'):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
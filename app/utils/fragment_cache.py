@@ -0,0 +1,114 @@
+"""
+Per-process cache of rendered post cards
+components/post_card.html is rendered for every post on every list page,
+although most posts haven't changed in months. Cards are cached under
+(post id, locale) together with the version they were rendered from -
+(updated_at, image count, newest image id) - so a stale card is never
+served: it just fails the version check and is re-rendered. Eviction is
+LRU, bounded by the total size of the cached HTML.
+
+Cards must not contain anything per-session (CSRF tokens live on <body>).
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from flask import get_template_attribute
+from markupsafe import Markup
+from sqlalchemy import event, func
+from app import db
+from app.models.image import Image
+from app.models.post import Post
+
+
+class FragmentCache:
+    def __init__(self, max_bytes: int = 8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, version, html: str):
+        entry_size = sys.getsizeof(html)
+        if entry_size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= sys.getsizeof(old[1])
+            self._entries[key] = (version, html)
+            self.size += entry_size
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size -= sys.getsizeof(evicted)
+
+    def invalidate_post(self, post_id: int):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == post_id]:
+                self.size -= sys.getsizeof(self._entries.pop(key)[1])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+post_card_cache = FragmentCache()
+
+
+def image_versions(post_ids):
+    """{post_id: (image count, newest image id)} in one query for a page of posts"""
+    if not post_ids:
+        return {}
+    rows = db.session.query(Image.post_id, func.count(Image.id), func.max(Image.id)).filter(
+        Image.post_id.in_(post_ids)
+    ).group_by(Image.post_id)
+    return {post_id: (count, max_id) for post_id, count, max_id in rows}
+
+
+def render_post_cards(posts):
+    """Rendered post cards for ``posts``, served from the cache where current.
+
+    Only cache misses touch ``post.images``, so a page of unchanged posts
+    renders without loading any images.
+    """
+    from flask_babel import get_locale
+    locale = str(get_locale())
+    versions = image_versions([post.id for post in posts])
+    post_card = None
+
+    cards = []
+    for post in posts:
+        key = (post.id, locale)
+        version = (post.updated_at, versions.get(post.id, (0, None)))
+        html = post_card_cache.get(key, version) if post_card_cache.max_bytes > 0 else None
+        if html is None:
+            if post_card is None:
+                post_card = get_template_attribute('components/post_card.html', 'post_card')
+            html = str(post_card(post))
+            post_card_cache.put(key, version, html)
+        cards.append(html)
+    return Markup(''.join(cards))
+
+
+def init_fragment_cache(app):
+    post_card_cache.max_bytes = app.config.get('FRAGMENT_CACHE_MAX_BYTES', 8 * 1024 * 1024)
+    app.add_template_global(render_post_cards)
+
+
+# Drops stale cards in this worker; other workers skip them via the version check
+@event.listens_for(Post, 'after_delete')
+def _invalidate_post_card(mapper, connection, target):
+    post_card_cache.invalidate_post(target.id)
@@ -0,0 +1,177 @@
+"""
+Per-user hashtag suggestions for the post editor
+Each user's index maps hashtag -> (use count, last used) and keeps the names
+in a sorted list, so a prefix lookup is a bisect plus ranking the matches.
+Indexes are built lazily from post_hashtags on the first lookup and then
+updated incrementally from the Post save events of this worker - once the
+transaction commits - without re-reading the user's posts.
+
+Indexes are evicted least-recently-used once the total number of indexed
+tags exceeds HASHTAG_SUGGEST_MAX_TAGS, and rebuilt after
+HASHTAG_SUGGEST_TTL seconds so saves handled by other workers show up.
+"""
+
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from datetime import datetime
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import object_session
+from app import db
+from app.models.hashtag import Hashtag, parse_hashtags, post_hashtags
+from app.models.post import Post
+
+# Ranking: use count, halved for every RECENCY_HALF_LIFE_DAYS since last use
+RECENCY_HALF_LIFE_DAYS = 90
+
+
+class UserHashtagIndex:
+    def __init__(self, usage):
+        # usage: {name: [count, last_used]}
+        self.usage = usage
+        self.names = sorted(usage)
+        self.built_at = time.monotonic()
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name, used_at):
+        entry = self.usage.get(name)
+        if entry is None:
+            self.usage[name] = [1, used_at]
+            insort(self.names, name)
+        else:
+            entry[0] += 1
+            entry[1] = max(entry[1], used_at) if entry[1] else used_at
+
+    def remove(self, name):
+        entry = self.usage.get(name)
+        if entry is None:
+            return
+        entry[0] -= 1
+        if entry[0] <= 0:
+            del self.usage[name]
+            del self.names[bisect_left(self.names, name)]
+
+    def suggest(self, prefix, limit, now):
+        start = bisect_left(self.names, prefix)
+        end = bisect_left(self.names, prefix + '\uffff')
+
+        def score(name):
+            count, last_used = self.usage[name]
+            age_days = (now - last_used).total_seconds() / 86400 if last_used else 365
+            return count * 0.5 ** (max(age_days, 0) / RECENCY_HALF_LIFE_DAYS)
+
+        ranked = sorted(self.names[start:end], key=lambda name: (-score(name), name))[:limit]
+        return [{'name': name, 'count': self.usage[name][0]} for name in ranked]
+
+
+class HashtagSuggestionIndex:
+    def __init__(self, max_tags: int = 200_000, ttl: int = 300):
+        self.max_tags = max_tags
+        self.ttl = ttl
+        self.size = 0
+        self._indexes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _load(self, user_id):
+        rows = db.session.query(Hashtag.name, func.count(post_hashtags.c.post_id), func.max(Post.updated_at))\
+                         .join(post_hashtags, post_hashtags.c.hashtag_id == Hashtag.id)\
+                         .join(Post, Post.id == post_hashtags.c.post_id)\
+                         .filter(post_hashtags.c.user_id == user_id)\
+                         .group_by(Hashtag.id, Hashtag.name)
+        return UserHashtagIndex({name: [count, last_used] for name, count, last_used in rows})
+
+    def suggest(self, user_id, prefix, limit=8):
+        prefix = prefix.lstrip('#').lower()
+        with self._lock:
+            index = self._indexes.get(user_id)
+            if index is not None and time.monotonic() - index.built_at > self.ttl:
+                self._drop(user_id)
+                index = None
+            if index is not None:
+                self._indexes.move_to_end(user_id)
+                return index.suggest(prefix, limit, datetime.utcnow())
+
+        index = self._load(user_id)
+        with self._lock:
+            if user_id in self._indexes:
+                self._drop(user_id)
+            self._indexes[user_id] = index
+            self.size += len(index)
+            while self.size > self.max_tags and len(self._indexes) > 1:
+                self._drop(next(iter(self._indexes)))
+            return index.suggest(prefix, limit, datetime.utcnow())
+
+    def apply(self, user_id, added, removed, used_at):
+        """Apply one post's hashtag changes to the user's index, if it is loaded"""
+        with self._lock:
+            index = self._indexes.get(user_id)
+            if index is None:
+                return
+            self.size -= len(index)
+            for name in removed:
+                index.remove(name)
+            for name in added:
+                index.add(name, used_at)
+            self.size += len(index)
+
+    def _drop(self, user_id):
+        self.size -= len(self._indexes.pop(user_id))
+
+    def clear(self):
+        with self._lock:
+            self._indexes.clear()
+            self.size = 0
+
+
+hashtag_suggestions = HashtagSuggestionIndex()
+
+
+def init_hashtag_suggestions(app):
+    hashtag_suggestions.max_tags = app.config.get('HASHTAG_SUGGEST_MAX_TAGS', 200_000)
+    hashtag_suggestions.ttl = app.config.get('HASHTAG_SUGGEST_TTL', 300)
+
+
+# Changes are queued on the session and applied only once it commits
+def _queue_change(target, added, removed):
+    session = object_session(target)
+    if session is not None and (added or removed):
+        session.info.setdefault('hashtag_suggestion_changes', []).append((target.user_id, added, removed))
+
+
+@event.listens_for(Post, 'after_insert')
+def _post_inserted(mapper, connection, target):
+    _queue_change(target, parse_hashtags(target.hashtags), [])
+
+
+@event.listens_for(Post, 'after_update')
+def _post_updated(mapper, connection, target):
+    history = inspect(target).attrs.hashtags.history
+    if not history.has_changes():
+        return
+    old = set(parse_hashtags(history.deleted[0] if history.deleted else ''))
+    new = set(parse_hashtags(target.hashtags))
+    _queue_change(target, sorted(new - old), sorted(old - new))
+
+
+@event.listens_for(Post, 'after_delete')
+def _post_deleted(mapper, connection, target):
+    history = inspect(target).attrs.hashtags.history
+    text = history.deleted[0] if history.deleted else target.hashtags
+    _queue_change(target, [], parse_hashtags(text))
+
+
+@event.listens_for(db.session, 'after_commit')
+def _apply_changes(session):
+    changes = session.info.pop('hashtag_suggestion_changes', None)
+    if changes:
+        used_at = datetime.utcnow()
+        for user_id, added, removed in changes:
+            hashtag_suggestions.apply(user_id, added, removed, used_at)
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _forget_changes(session):
+    session.info.pop('hashtag_suggestion_changes', None)
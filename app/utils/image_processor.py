@@ -3,6 +3,7 @@ import os
 import uuid
 from werkzeug.utils import secure_filename
 from typing import Dict
+from app.utils.metrics import THUMBNAIL_SECONDS
 
 class ImageProcessor:
     def __init__(self, upload_folder: str):
@@ -65,7 +66,7 @@ class ImageProcessor:
     def _create_thumbnail(self, filepath: str, size: tuple = (300, 300)) -> str:
         """Create thumbnail image"""
         try:
-            with Image.open(filepath) as img:
+            with THUMBNAIL_SECONDS.time(), Image.open(filepath) as img:
                 # Convert to RGB if necessary (for PNG with transparency)
                 if img.mode in ('RGBA', 'LA', 'P'):
                     background = Image.new('RGB', img.size, (255, 255, 255))
@@ -14,6 +14,7 @@ class LinkedInSpecificParser:
     """Enhanced LinkedIn PDF parser based on real LinkedIn PDF structure analysis"""
     
     def __init__(self):
+        self.page_count = 0
         self.timestamp_pattern = r'(\d+)\s+(Monate?|Wochen?|Tage?|Stunden?)\s*[•·]?'
         self.company_pattern = r'([^\n]+(?:GmbH|AG|Inc|LLC|Ltd|Corporation|Corp)[^\n]*)'
         self.follower_pattern = r'(\d+(?:\.\d+)?[KM]?)\s+Follower'
@@ -50,6 +51,7 @@ class LinkedInSpecificParser:
         all_text = ""
         
         with pdfplumber.open(pdf_path) as pdf:
+            self.page_count = len(pdf.pages)
             for i, page in enumerate(pdf.pages[:10]):  # Limit to 10 pages
                 try:
                     page_text = page.extract_text()
@@ -67,6 +69,7 @@ class LinkedInSpecificParser:
         
         with open(pdf_path, 'rb') as file:
             reader = PyPDF2.PdfReader(file)
+            self.page_count = len(reader.pages)
             for i, page in enumerate(reader.pages[:10]):
                 try:
                     page_text = page.extract_text()
@@ -0,0 +1,110 @@
+"""
+Serving of uploaded media.
+
+Uploaded images get a unique ``<uuid>_<name>`` filename and are never
+rewritten, so a response can carry a strong ETag derived from the image row
+and be cached for a year. The ownership check always runs in Flask; with
+``MEDIA_ACCEL`` set, the byte transfer itself is handed to the front proxy:
+
+- ``nginx``: ``X-Accel-Redirect`` to ``MEDIA_ACCEL_PREFIX`` + filename,
+  which nginx maps to the upload folder in an ``internal`` location
+- ``sendfile``: ``X-Sendfile`` with the absolute path (Apache mod_xsendfile,
+  lighttpd)
+"""
+import os
+from urllib.parse import quote
+
+from flask import abort, current_app, request, url_for
+from werkzeug.security import safe_join
+from werkzeug.utils import send_file
+
+MEDIA_MAX_AGE = 365 * 24 * 60 * 60
+# Folders under static/ that the plain static view must never serve
+UPLOAD_FOLDER_KEYS = ('UPLOAD_FOLDER', 'IMAGE_UPLOAD_FOLDER', 'PDF_UPLOAD_FOLDER')
+
+
+def find_image(image_id, filename):
+    """Image row joined with its post's owner/sharing state, or None"""
+    from app.models import Image, Post
+    row = Image.query.with_entities(
+        Image.id, Image.filename, Image.file_size, Image.mime_type, Image.uploaded_at,
+        Post.user_id, Post.is_shared
+    ).join(Post).filter(Image.id == image_id).first()
+    if row is None or row.filename != filename:
+        return None
+    return row
+
+
+def send_image(row):
+    return send_media(
+        current_app.config['IMAGE_UPLOAD_FOLDER'], row.filename, row.mime_type,
+        etag=image_etag(row), last_modified=row.uploaded_at
+    )
+
+
+def image_etag(image):
+    """Strong ETag for an image row; the file behind it never changes"""
+    # file_size is NULL on rows written by older imports
+    return f'img{image.id}-{image.file_size or 0:x}'
+
+
+def send_media(folder, filename, mimetype, etag, last_modified=None):
+    """Conditional, long-cached response for an immutable uploaded file"""
+    accel = current_app.config.get('MEDIA_ACCEL')
+    path = safe_join(folder, filename)
+    if path is None:
+        abort(404)
+
+    if accel == 'nginx':
+        prefix = current_app.config.get('MEDIA_ACCEL_PREFIX', '/protected-media/images/')
+        response = current_app.response_class(mimetype=mimetype)
+        response.headers['X-Accel-Redirect'] = prefix + quote(filename)
+        response.set_etag(etag)
+        response.last_modified = last_modified
+    elif os.path.isfile(path):
+        # Without a proxy, werkzeug answers If-None-Match and Range requests;
+        # with X-Sendfile the proxy does the range handling
+        response = send_file(
+            path, request.environ, mimetype=mimetype, etag=etag, last_modified=last_modified,
+            use_x_sendfile=accel == 'sendfile', conditional=accel != 'sendfile',
+            response_class=current_app.response_class
+        )
+    else:
+        abort(404)
+
+    # Private: access is checked per user, so shared caches must not store it
+    response.cache_control.public = None
+    response.cache_control.no_cache = None
+    response.cache_control.private = True
+    response.cache_control.max_age = MEDIA_MAX_AGE
+    response.cache_control.immutable = True
+    if accel:
+        response = response.make_conditional(request)
+    return response
+
+
+def init_media(app):
+    """Register ``media_url()`` and stop serving uploads as public static files"""
+
+    @app.template_global()
+    def media_url(image):
+        return url_for('media.image', image_id=image.id, filename=image.filename)
+
+    static_view = app.view_functions.get('static')
+    if static_view is None:
+        return
+
+    upload_folders = [os.path.realpath(app.config[key]) for key in UPLOAD_FOLDER_KEYS if app.config.get(key)]
+
+    def static_without_uploads(filename):
+        # Resolve the path the static view would open, so dot segments
+        # ("./uploads/...", "css/../uploads/...") and symlinks can't skip the check
+        path = safe_join(app.static_folder, filename)
+        if path is None:
+            abort(404)
+        path = os.path.realpath(path)
+        if any(path == folder or path.startswith(folder + os.sep) for folder in upload_folders):
+            abort(404)
+        return static_view(filename=filename)
+
+    app.view_functions['static'] = static_without_uploads
@@ -0,0 +1,151 @@
+"""
+Worker memory diagnostics for PostForge
+Wraps tracemalloc so admins can trace allocations in a worker, dump snapshots
+to disk and compare them, and reports RSS and live object counts per type.
+
+tracing is per process: start/stop only affect the worker that handles the
+request. Snapshots are written to a shared folder tagged with the worker pid,
+so any worker can display and compare them.
+"""
+
+import gc
+import os
+import re
+import resource
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+
+_SNAPSHOT_NAME = re.compile(r'^\d+_\d{8}_\d{6}_\d+\.snapshot$')
+
+# Allocations made by the diagnostics themselves only add noise
+_SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+]
+
+
+def tracing_status() -> Dict:
+    current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+    return {
+        'pid': os.getpid(),
+        'is_tracing': tracemalloc.is_tracing(),
+        'frames': tracemalloc.get_traceback_limit(),
+        'traced_current': current,
+        'traced_peak': peak
+    }
+
+
+def start_tracing(frames: int = 10):
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+
+
+def stop_tracing():
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def take_snapshot(folder: str, max_files: int = 20) -> str:
+    """Dump a filtered snapshot of this worker's traced allocations; returns its filename"""
+    if not tracemalloc.is_tracing():
+        raise RuntimeError('tracemalloc ist in diesem Worker nicht aktiv')
+
+    os.makedirs(folder, exist_ok=True)
+    snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+    filename = f"{os.getpid()}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.snapshot"
+    snapshot.dump(os.path.join(folder, filename))
+
+    for old in list_snapshots(folder)[max_files:]:
+        try:
+            os.remove(os.path.join(folder, old['filename']))
+        except OSError:
+            pass
+    return filename
+
+
+def list_snapshots(folder: str) -> List[Dict]:
+    """Stored snapshots, newest first"""
+    try:
+        entries = os.listdir(folder)
+    except OSError:
+        return []
+
+    snapshots = []
+    for entry in entries:
+        if not _SNAPSHOT_NAME.match(entry):
+            continue
+        stat = os.stat(os.path.join(folder, entry))
+        snapshots.append({
+            'filename': entry,
+            'pid': int(entry.split('_', 1)[0]),
+            'size': stat.st_size,
+            'created_at': datetime.fromtimestamp(stat.st_mtime)
+        })
+    return sorted(snapshots, key=lambda snapshot: snapshot['created_at'], reverse=True)
+
+
+def _load_snapshot(folder: str, filename: str) -> Optional[tracemalloc.Snapshot]:
+    if not filename or not _SNAPSHOT_NAME.match(filename):
+        return None
+    path = os.path.join(folder, filename)
+    if not os.path.isfile(path):
+        return None
+    return tracemalloc.Snapshot.load(path)
+
+
+def _format_stat(stat, size_diff=None, count_diff=None) -> Dict:
+    frame = stat.traceback[0]
+    return {
+        'location': f'{frame.filename}:{frame.lineno}',
+        'traceback': stat.traceback.format(),
+        'size': stat.size,
+        'count': stat.count,
+        'size_diff': size_diff,
+        'count_diff': count_diff
+    }
+
+
+def top_allocations(folder: str, filename: str, key_type: str = 'lineno', limit: int = 30) -> Optional[List[Dict]]:
+    """Largest allocation sites in a snapshot"""
+    snapshot = _load_snapshot(folder, filename)
+    if snapshot is None:
+        return None
+    return [_format_stat(stat) for stat in snapshot.statistics(key_type)[:limit]]
+
+
+def compare_snapshots(folder: str, old_filename: str, new_filename: str,
+                      key_type: str = 'lineno', limit: int = 30) -> Optional[List[Dict]]:
+    """Allocation sites that grew the most between two snapshots"""
+    old = _load_snapshot(folder, old_filename)
+    new = _load_snapshot(folder, new_filename)
+    if old is None or new is None:
+        return None
+    return [
+        _format_stat(stat, stat.size_diff, stat.count_diff)
+        for stat in new.compare_to(old, key_type)[:limit]
+    ]
+
+
+def current_rss_bytes() -> int:
+    """Resident set size of this worker (falls back to peak RSS without /proc)"""
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def peak_rss_bytes() -> int:
+    # ru_maxrss is reported in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def object_type_counts(limit: int = 30) -> List[tuple]:
+    """Most common live object types tracked by the garbage collector"""
+    counts = Counter(type(obj).__name__ for obj in gc.get_objects())
+    return counts.most_common(limit)
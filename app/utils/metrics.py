@@ -0,0 +1,75 @@
+"""
+Prometheus metrics for PostForge
+
+When PROMETHEUS_MULTIPROC_DIR is set (gunicorn.conf.py does this) every worker
+writes its samples to that shared directory and /metrics aggregates them, so
+scrapes see the whole server rather than whichever worker answered.
+"""
+
+import os
+import time
+from flask import g, request
+from prometheus_client import (
+    CollectorRegistry, Counter, Histogram, REGISTRY, CONTENT_TYPE_LATEST, generate_latest, multiprocess
+)
+
+REQUEST_LATENCY = Histogram(
+    'postforge_request_duration_seconds', 'Request latency by endpoint',
+    ['endpoint', 'method'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+UPLOAD_BYTES = Counter(
+    'postforge_upload_bytes_total', 'Bytes received through uploads', ['kind']
+)
+PDF_PARSE_SECONDS = Histogram(
+    'postforge_pdf_parse_duration_seconds', 'Time spent parsing uploaded PDFs',
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+)
+PDF_PAGES = Histogram(
+    'postforge_pdf_pages', 'Page count of uploaded PDFs',
+    buckets=(1, 2, 5, 10, 20, 50, 100, 250)
+)
+EXPORT_BYTES = Histogram(
+    'postforge_export_size_bytes', 'Size of generated export archives',
+    buckets=(1e5, 1e6, 1e7, 5e7, 1e8, 5e8, 1e9, 5e9)
+)
+EXPORT_SECONDS = Histogram(
+    'postforge_export_duration_seconds', 'Time spent building export archives',
+    buckets=(0.5, 1, 5, 15, 30, 60, 120, 300, 600, 1800)
+)
+IMPORT_BYTES = Histogram(
+    'postforge_import_size_bytes', 'Size of imported ZIP archives',
+    buckets=(1e5, 1e6, 1e7, 5e7, 1e8, 5e8, 1e9, 5e9)
+)
+IMPORT_SECONDS = Histogram(
+    'postforge_import_duration_seconds', 'Time spent importing ZIP archives',
+    buckets=(0.5, 1, 5, 15, 30, 60, 120, 300, 600, 1800)
+)
+THUMBNAIL_SECONDS = Histogram(
+    'postforge_thumbnail_duration_seconds', 'Time spent generating image thumbnails',
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+
+
+def init_metrics(app):
+    """Record request latency per blueprint endpoint"""
+
+    @app.before_request
+    def start_metrics_timer():
+        g.metrics_start = time.perf_counter()
+
+    @app.teardown_request
+    def observe_request_latency(exc):
+        start = g.pop('metrics_start', None)
+        if start is not None:
+            REQUEST_LATENCY.labels(request.endpoint or 'unmatched', request.method).observe(time.perf_counter() - start)
+
+
+def render_metrics():
+    """Return (payload, content_type) in the Prometheus text format"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,70 @@
+"""
+MinHash signatures and LSH banding for near-duplicate posts
+A post's content is normalized (case, punctuation, whitespace) and cut into
+overlapping word 3-grams. The signature holds, for each of NUM_PERM hash
+functions, the minimum hash over those shingles; the share of equal values
+between two signatures estimates the Jaccard similarity of their shingles.
+
+For candidate lookup the signature is split into BANDS bands of ROWS values
+and each band hashed to a bucket key. Two posts share at least one bucket
+with probability 1 - (1 - J^ROWS)^BANDS - about 97% at J = 0.7 and 5% at
+J = 0.3 - so candidates come from an indexed bucket lookup instead of a
+comparison against every post.
+
+NumPy is imported with this module; import it where it is used.
+"""
+
+import hashlib
+import re
+import zlib
+import numpy as np
+
+NUM_PERM = 100
+BANDS = 20
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+DUPLICATE_THRESHOLD = 0.7  # estimated Jaccard similarity
+
+_PRIME = 4294967311  # smallest prime above 2**32
+_rng = np.random.RandomState(20240501)  # fixed, so signatures are stable across processes
+_A = _rng.randint(1, 2 ** 31 - 1, size=NUM_PERM).astype(np.uint64)
+_B = _rng.randint(0, 2 ** 31 - 1, size=NUM_PERM).astype(np.uint64)
+_WORD = re.compile(r'\w+')
+
+
+def shingles(text):
+    words = _WORD.findall((text or '').casefold())
+    if len(words) < SHINGLE_SIZE:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def signature(text):
+    """MinHash signature of ``text`` as NUM_PERM uint32 values, or None if it has no words"""
+    hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles(text)), dtype=np.uint64)
+    if not len(hashes):
+        return None
+    values = (_A[:, None] * hashes[None, :] + _B[:, None]) % _PRIME
+    return (values.min(axis=1) & 0xFFFFFFFF).astype(np.uint32)
+
+
+def to_bytes(sig):
+    return sig.astype('<u4').tobytes()
+
+
+def from_bytes(data):
+    return np.frombuffer(data, dtype='<u4')
+
+
+def band_keys(sig):
+    """One signed 64-bit bucket key per band"""
+    keys = []
+    for band in range(BANDS):
+        digest = hashlib.blake2b(bytes([band]) + to_bytes(sig[band * ROWS:(band + 1) * ROWS]), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, 'big', signed=True))
+    return keys
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.mean(sig_a == sig_b))
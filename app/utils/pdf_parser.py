@@ -12,6 +12,7 @@ class LinkedInPDFParser:
         ]
         self.hashtag_pattern = r'#\w+'
         self.engagement_pattern = r'(\d+)\s+(Likes?|Kommentare?|Comments?)'
+        self.page_count = 0
     
     def parse_pdf(self, pdf_path: str) -> List[Dict]:
         """Parse LinkedIn PDF using enhanced LinkedIn-specific parser"""
@@ -19,6 +20,7 @@ class LinkedInPDFParser:
             # Use the new LinkedIn-specific parser
             linkedin_parser = LinkedInSpecificParser()
             posts = linkedin_parser.parse_pdf(pdf_path)
+            self.page_count = linkedin_parser.page_count
             
             # Convert to legacy format for compatibility
             legacy_posts = []
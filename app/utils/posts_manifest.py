@@ -0,0 +1,97 @@
+"""
+Posts manifest format for PostForge export archives
+
+Version 2 manifests (posts.ndjson) store one JSON document per line: a header
+line identifying the format, followed by one line per post. They are written
+incrementally during export and read line by line during import, so memory
+use does not grow with the size of the library. Version 1 archives
+(posts.json, a single JSON array) are still accepted when importing.
+"""
+
+import json
+import os
+from typing import Dict, IO, Iterator
+
+MANIFEST_FORMAT = 'postforge-posts'
+MANIFEST_VERSION = 2
+MANIFEST_FILENAME = 'posts.ndjson'
+LEGACY_MANIFEST_FILENAME = 'posts.json'
+
+
+def serialize_post(post) -> Dict:
+    """Convert a Post and its images into a manifest record"""
+    return {
+        'id': post.id,
+        'title': post.title,
+        'content': post.content,
+        'hashtags': post.hashtags,
+        'notes': post.notes,
+        'status': post.status,
+        'scheduled_for': getattr(post, 'scheduled_for', None).isoformat() if getattr(post, 'scheduled_for', None) else None,
+        'created_at': post.created_at.isoformat(),
+        'updated_at': post.updated_at.isoformat(),
+        'engagement_stats': getattr(post, 'engagement_stats', None),
+        'images': [{
+            'filename': image.filename,
+            'original_filename': getattr(image, 'original_filename', image.filename),
+            'file_path': getattr(image, 'file_path', ''),
+            'file_size': getattr(image, 'file_size', 0),
+            'mime_type': getattr(image, 'mime_type', 'image/jpeg'),
+            'uploaded_at': image.uploaded_at.isoformat()
+        } for image in post.images]
+    }
+
+
+class ManifestWriter:
+    """Streaming NDJSON encoder writing one post per line to a text stream"""
+
+    def __init__(self, stream: IO[str]):
+        self.stream = stream
+        self.count = 0
+        self.stream.write(json.dumps({'format': MANIFEST_FORMAT, 'version': MANIFEST_VERSION}) + '\n')
+
+    def write(self, record: Dict):
+        self.stream.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+        self.count += 1
+
+
+def iter_manifest(stream: IO[str]) -> Iterator[Dict]:
+    """Decode an NDJSON manifest line by line, yielding post records"""
+    header = None
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+
+        record = json.loads(line)
+        if header is None:
+            header = record
+            if header.get('format') != MANIFEST_FORMAT:
+                raise ValueError('Unbekanntes Manifest-Format')
+            if header.get('version', 0) > MANIFEST_VERSION:
+                raise ValueError(f"Manifest-Version {header.get('version')} wird nicht unterstützt")
+            continue
+
+        if not isinstance(record, dict):
+            raise ValueError(f'Ungültiger Eintrag in Zeile {line_number}')
+        yield record
+
+
+def iter_archive_posts(extract_dir: str) -> Iterator[Dict]:
+    """Yield post records from an extracted export, accepting both manifest versions"""
+    ndjson_path = os.path.join(extract_dir, MANIFEST_FILENAME)
+    if os.path.exists(ndjson_path):
+        with open(ndjson_path, 'r', encoding='utf-8') as f:
+            yield from iter_manifest(f)
+        return
+
+    legacy_path = os.path.join(extract_dir, LEGACY_MANIFEST_FILENAME)
+    if os.path.exists(legacy_path):
+        with open(legacy_path, 'r', encoding='utf-8') as f:
+            posts_data = json.load(f)
+        if not isinstance(posts_data, list):
+            raise ValueError('Ungültiges posts.json-Format')
+        yield from posts_data
+        return
+
+    raise FileNotFoundError('Kein Post-Manifest gefunden')
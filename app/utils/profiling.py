@@ -0,0 +1,125 @@
+"""
+On-demand CPU profiling of individual requests
+
+An admin triggers profiling of a single request either by adding `?_profile=1`
+while logged in, or by sending a signed `X-PostForge-Profile` token (handy for
+curl and API clients). The request then runs under cProfile and the pstats
+output is written to PROFILE_FOLDER. Requests without a trigger only pay for
+one dictionary lookup.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import re
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+from flask import g, request
+from flask_login import current_user
+from itsdangerous import URLSafeTimedSerializer, BadSignature
+
+PROFILE_QUERY_FLAG = '_profile'
+PROFILE_HEADER = 'X-PostForge-Profile'
+PROFILE_TOKEN_SALT = 'postforge-request-profile'
+PROFILE_TOKEN_MAX_AGE = 60 * 60
+
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^A-Za-z0-9_.-]+')
+
+
+def generate_profile_token(secret_key: str) -> str:
+    """Signed header value that enables profiling for one hour"""
+    return URLSafeTimedSerializer(secret_key, salt=PROFILE_TOKEN_SALT).dumps('profile')
+
+
+def _valid_profile_token(secret_key: str, token: str) -> bool:
+    try:
+        URLSafeTimedSerializer(secret_key, salt=PROFILE_TOKEN_SALT).loads(token, max_age=PROFILE_TOKEN_MAX_AGE)
+        return True
+    except BadSignature:
+        return False
+
+
+def init_profiling(app):
+    """Profile requests that carry an admin profiling trigger"""
+    folder = app.config['PROFILE_FOLDER']
+    max_files = app.config['PROFILE_MAX_FILES']
+
+    @app.before_request
+    def start_profiler():
+        header_token = request.headers.get(PROFILE_HEADER)
+        if header_token is None and PROFILE_QUERY_FLAG not in request.args:
+            return
+
+        if header_token is not None:
+            allowed = _valid_profile_token(app.config['SECRET_KEY'], header_token)
+        else:
+            allowed = current_user.is_authenticated and current_user.username == 'admin'
+        if not allowed:
+            return
+
+        g.profiler = cProfile.Profile()
+        g.profiler_start = time.perf_counter()
+        g.profiler.enable()
+
+    @app.teardown_request
+    def stop_profiler(exc):
+        profiler = g.pop('profiler', None)
+        if profiler is None:
+            return
+
+        profiler.disable()
+        elapsed_ms = (time.perf_counter() - g.pop('profiler_start')) * 1000
+        endpoint = _UNSAFE_FILENAME_CHARS.sub('_', request.endpoint or 'unmatched')
+        filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{endpoint}_{elapsed_ms:.0f}ms.prof"
+
+        os.makedirs(folder, exist_ok=True)
+        profiler.dump_stats(os.path.join(folder, filename))
+        _prune_profiles(folder, max_files)
+
+
+def _prune_profiles(folder: str, max_files: int):
+    profiles = list_profiles(folder)
+    for profile in profiles[max_files:]:
+        try:
+            os.remove(os.path.join(folder, profile['filename']))
+        except OSError:
+            pass
+
+
+def list_profiles(folder: str) -> List[Dict]:
+    """Stored profiles, newest first"""
+    try:
+        entries = os.listdir(folder)
+    except OSError:
+        return []
+
+    profiles = []
+    for entry in entries:
+        if not entry.endswith('.prof'):
+            continue
+        path = os.path.join(folder, entry)
+        stat = os.stat(path)
+        profiles.append({
+            'filename': entry,
+            'size': stat.st_size,
+            'created_at': datetime.fromtimestamp(stat.st_mtime)
+        })
+    return sorted(profiles, key=lambda profile: profile['filename'], reverse=True)
+
+
+def profile_path(folder: str, filename: str) -> Optional[str]:
+    """Absolute path of a stored profile, or None for unknown/unsafe names"""
+    if filename != os.path.basename(filename) or not filename.endswith('.prof'):
+        return None
+    path = os.path.join(folder, filename)
+    return path if os.path.isfile(path) else None
+
+
+def profile_stats_text(path: str, sort_by: str = 'cumulative', limit: int = 60) -> str:
+    """Render a stored profile as pstats text"""
+    stream = io.StringIO()
+    stats = pstats.Stats(path, stream=stream)
+    stats.strip_dirs().sort_stats(sort_by).print_stats(limit)
+    return stream.getvalue()
@@ -0,0 +1,216 @@
+"""
+Tagged cache for Post query results
+Dashboard statistics, the search suggestions and the image lists re-run the
+same queries for data that rarely changes. Results are cached under a key
+that includes the current generation of each of their tags ('user:<id>',
+'post:<id>'); purging a tag bumps its generation, so every entry tagged with
+it stops matching and simply ages out of the LRU.
+
+Without a backend, entries and tag generations live in this worker only and
+writes made by other workers show up once QUERY_CACHE_TTL expires. With a
+shared backend (QUERY_CACHE_BACKEND=redis://...) tag generations and values
+are shared, so purges are visible everywhere at once; the in-process LRU is
+then only a first level that still reads the generations on every lookup.
+
+Cached values must be plain data (dicts, lists, ids) - never ORM objects.
+"""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+from sqlalchemy import event
+from sqlalchemy.orm import object_session
+from app import db
+from app.models.image import Image
+from app.models.post import Post
+
+KEY_PREFIX = 'qc:'
+
+
+class MemoryBackend:
+    """Shared-backend interface implemented with a dict; a local stand-in for Redis"""
+
+    def __init__(self):
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        now = time.monotonic()
+        with self._lock:
+            values = []
+            for key in keys:
+                entry = self._values.get(key)
+                if entry is not None and entry[1] is not None and entry[1] <= now:
+                    del self._values[key]
+                    entry = None
+                values.append(entry[0] if entry else None)
+            return values
+
+    def set(self, key: str, value: bytes, ttl: int):
+        with self._lock:
+            self._values[key] = (value, time.monotonic() + ttl)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = int(self._values.get(key, (b'0', None))[0]) + 1
+            self._values[key] = (str(value).encode(), None)
+            return value
+
+
+class RedisBackend:
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('QUERY_CACHE_BACKEND points at Redis, but the redis package is not installed')
+        self._client = redis.Redis.from_url(url)
+
+    def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        return self._client.mget(keys)
+
+    def set(self, key: str, value: bytes, ttl: int):
+        self._client.setex(key, ttl, value)
+
+    def incr(self, key: str) -> int:
+        return self._client.incr(key)
+
+
+def create_backend(spec: Optional[str]):
+    """Backend for QUERY_CACHE_BACKEND: '' (none), 'memory' or a redis:// URL"""
+    if not spec:
+        return None
+    if spec == 'memory':
+        return MemoryBackend()
+    if spec.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisBackend(spec)
+    raise ValueError(f'Unknown QUERY_CACHE_BACKEND: {spec}')
+
+
+class QueryCache:
+    def __init__(self, max_entries: int = 2000, ttl: int = 30, backend=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl > 0
+
+    def _tag_generations(self, tags: List[str]) -> tuple:
+        if self.backend is not None:
+            values = self.backend.get_many([f'{KEY_PREFIX}tag:{tag}' for tag in tags])
+            return tuple(int(value) if value else 0 for value in values)
+        with self._lock:
+            return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def get_or_set(self, key: str, tags: Iterable[str], loader: Callable):
+        """Cached result of ``loader()`` for ``key``; ``None`` results are not cached"""
+        if not self.enabled:
+            return loader()
+
+        tags = sorted(set(tags))
+        generations = self._tag_generations(tags)
+        full_key = f'{KEY_PREFIX}{key}|' + ','.join(f'{tag}={gen}' for tag, gen in zip(tags, generations))
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(full_key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(full_key)
+                self.hits += 1
+                return entry[0]
+
+        value = None
+        if self.backend is not None:
+            stored = self.backend.get_many([full_key])[0]
+            if stored is not None:
+                value = pickle.loads(stored)
+
+        if value is None:
+            value = loader()
+            if value is None:
+                return None
+            if self.backend is not None:
+                self.backend.set(full_key, pickle.dumps(value), self.ttl)
+            with self._lock:
+                self.misses += 1
+        else:
+            with self._lock:
+                self.hits += 1
+
+        with self._lock:
+            self._entries[full_key] = (value, now + self.ttl)
+            self._entries.move_to_end(full_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def purge(self, *tags: str):
+        """Invalidate every entry tagged with any of ``tags``"""
+        for tag in tags:
+            if self.backend is not None:
+                self.backend.incr(f'{KEY_PREFIX}tag:{tag}')
+            else:
+                with self._lock:
+                    self._generations[tag] = self._generations.get(tag, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+
+query_cache = QueryCache()
+
+
+def cached_query(key: str, tags: Iterable[str], loader: Callable):
+    return query_cache.get_or_set(key, tags, loader)
+
+
+def init_query_cache(app):
+    query_cache.max_entries = app.config.get('QUERY_CACHE_MAX_ENTRIES', 2000)
+    query_cache.ttl = app.config.get('QUERY_CACHE_TTL', 30)
+    query_cache.backend = create_backend(app.config.get('QUERY_CACHE_BACKEND'))
+
+
+# Purge on flush so the writing request reads its own changes, and again after
+# commit so a concurrent request that re-cached the old rows in between is
+# dropped as well.
+def _purge_tags(target, tags):
+    query_cache.purge(*tags)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault('query_cache_tags', set()).update(tags)
+
+
+@event.listens_for(Post, 'after_insert')
+@event.listens_for(Post, 'after_update')
+@event.listens_for(Post, 'after_delete')
+def _purge_post(mapper, connection, target):
+    _purge_tags(target, {f'user:{target.user_id}', f'post:{target.id}'})
+
+
+@event.listens_for(Image, 'after_insert')
+@event.listens_for(Image, 'after_update')
+@event.listens_for(Image, 'after_delete')
+def _purge_image(mapper, connection, target):
+    _purge_tags(target, {f'post:{target.post_id}'})
+
+
+@event.listens_for(db.session, 'after_commit')
+def _purge_after_commit(session):
+    tags = session.info.pop('query_cache_tags', None)
+    if tags:
+        query_cache.purge(*tags)
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _forget_tags(session):
+    session.info.pop('query_cache_tags', None)
@@ -0,0 +1,334 @@
+"""
+Related-posts index: TF-IDF cosine similarity over a user's posts
+Every post (title, content and hashtags) becomes a sparse vector of hashed
+term features with log-scaled term frequencies; IDF weights come from the
+per-user document frequencies. A user's matrix is stored as flat NumPy
+arrays (row, feature, tf) sorted by feature, so a lookup is a single
+vectorized pass over the postings of the query's terms: np.bincount their
+weighted entries per row and divide by the row norms.
+
+Indexes are persisted to RELATED_INDEX_FOLDER as one .npz per user together
+with a watermark (the newest updated_at indexed). Each lookup first catches
+up on posts changed since the watermark and drops deleted posts, so edits
+made by any worker are picked up incrementally without a rebuild. Changed
+posts are appended as new rows and their old rows masked.
+
+NumPy is imported with this module, which is only loaded on first use.
+"""
+
+import math
+import os
+import re
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
+import numpy as np
+from flask import current_app
+from app import db
+from app.models.post import Post
+
+FEATURES = 2 ** 18
+TOKEN_PATTERN = re.compile(r'\w{2,}')
+FORMAT_VERSION = 2
+MIN_SIMILARITY = 0.1  # weaker matches are mostly shared filler words
+EPOCH = datetime(1970, 1, 1)
+
+
+def _version(updated_at):
+    return (updated_at - EPOCH) // timedelta(microseconds=1) if updated_at else 0
+
+
+def post_text(title, content, hashtags):
+    return ' '.join(part for part in (title, content, hashtags) if part)
+
+
+def vectorize(text):
+    """(features, log-scaled term frequencies) of one document"""
+    counts = Counter(zlib.crc32(token.encode()) & (FEATURES - 1)
+                     for token in TOKEN_PATTERN.findall(text.lower()))
+    features = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+    tf = np.fromiter((1 + math.log(count) for count in counts.values()), dtype=np.float32, count=len(counts))
+    return features, tf
+
+
+class UserRelatedIndex:
+    """One user's posts as a sparse TF-IDF matrix.
+
+    Entries (row, feature, tf) are kept sorted by feature - an inverted index,
+    so a lookup only touches the postings of the query's terms - followed by
+    an unsorted tail of rows added since the last consolidation. IDF weights
+    and row norms are frozen at consolidation; it runs again once the tail
+    or the dead rows grow too large.
+    """
+
+    def __init__(self):
+        # Per row
+        self.post_ids = np.zeros(0, dtype=np.int64)
+        self.versions = np.zeros(0, dtype=np.int64)  # updated_at in µs
+        self.alive = np.zeros(0, dtype=bool)
+        self.lengths = np.zeros(0, dtype=np.int32)
+        # Per entry; the first `sorted_count` are sorted by feature
+        self.rows = np.zeros(0, dtype=np.int32)
+        self.features = np.zeros(0, dtype=np.int32)
+        self.tf = np.zeros(0, dtype=np.float32)
+        self.sorted_count = 0
+        self.watermark = None
+        self.row_of = {}  # post id -> live row
+        self.dead_entries = 0
+        self.dirty = False
+        self.saved_at = 0.0
+        self._refresh_weights()
+
+    @property
+    def size(self):
+        return len(self.row_of)
+
+    def _refresh_weights(self):
+        live = self.alive[self.rows]
+        df = np.bincount(self.features[live], minlength=FEATURES)
+        self.idf = (np.log((1 + self.size) / (1 + df)) + 1).astype(np.float32)
+        self.weights = self.tf * self.idf[self.features]
+        self.norms = np.sqrt(np.bincount(self.rows, weights=self.weights ** 2, minlength=len(self.post_ids))).astype(np.float32)
+
+    def is_current(self, post_id, version):
+        row = self.row_of.get(post_id)
+        return row is not None and self.versions[row] == version
+
+    def _remove(self, post_id):
+        row = self.row_of.pop(post_id, None)
+        if row is not None:
+            self.alive[row] = False
+            self.dead_entries += int(self.lengths[row])
+
+    def update(self, posts):
+        """Index (post_id, text, version) triples, replacing earlier versions of the same posts"""
+        new_ids, new_versions, new_rows, new_features, new_tf = [], [], [], [], []
+        row = len(self.post_ids)
+        for post_id, text, version in posts:
+            self._remove(post_id)
+            # Posts without terms get an empty row, so every live post is in row_of
+            features, tf = vectorize(text)
+            new_ids.append(post_id)
+            new_versions.append(version)
+            new_rows.append(np.full(len(features), row, dtype=np.int32))
+            new_features.append(features)
+            new_tf.append(tf)
+            self.row_of[post_id] = row
+            row += 1
+
+        if new_ids:
+            weights = [tf * self.idf[features] for features, tf in zip(new_features, new_tf)]
+            self.post_ids = np.concatenate((self.post_ids, np.array(new_ids, dtype=np.int64)))
+            self.versions = np.concatenate((self.versions, np.array(new_versions, dtype=np.int64)))
+            self.alive = np.concatenate((self.alive, np.ones(len(new_ids), dtype=bool)))
+            self.lengths = np.concatenate((self.lengths, np.array([len(f) for f in new_features], dtype=np.int32)))
+            self.rows = np.concatenate([self.rows] + new_rows)
+            self.features = np.concatenate([self.features] + new_features)
+            self.tf = np.concatenate([self.tf] + new_tf)
+            self.weights = np.concatenate([self.weights] + weights)
+            self.norms = np.concatenate((self.norms, np.array([np.linalg.norm(w) for w in weights], dtype=np.float32)))
+        self.dirty = True
+        self._maybe_consolidate()
+
+    def remove(self, post_ids):
+        for post_id in post_ids:
+            self._remove(post_id)
+        self.dirty = True
+        self._maybe_consolidate()
+
+    def _maybe_consolidate(self):
+        tail = len(self.features) - self.sorted_count
+        if tail > self.sorted_count // 10 or self.dead_entries > len(self.features) // 3:
+            self.consolidate()
+
+    def consolidate(self):
+        """Drop dead rows, sort all entries by feature and recompute IDF and norms"""
+        keep_rows = np.flatnonzero(self.alive)
+        keep = self.alive[self.rows]
+        remap = np.full(len(self.alive), -1, dtype=np.int32)
+        remap[keep_rows] = np.arange(len(keep_rows), dtype=np.int32)
+        rows, features, tf = remap[self.rows[keep]], self.features[keep], self.tf[keep]
+        order = np.argsort(features, kind='stable')
+        self.rows, self.features, self.tf = rows[order], features[order], tf[order]
+        self.sorted_count = len(self.features)
+        self.post_ids = self.post_ids[keep_rows]
+        self.versions = self.versions[keep_rows]
+        self.lengths = self.lengths[keep_rows]
+        self.alive = np.ones(len(keep_rows), dtype=bool)
+        self.row_of = {int(post_id): row for row, post_id in enumerate(self.post_ids)}
+        self.dead_entries = 0
+        self._refresh_weights()
+
+    def similar(self, text, limit=5, exclude=()):
+        """[(post_id, cosine similarity)] of the rows most similar to ``text``"""
+        features, tf = vectorize(text)
+        if not len(features) or not self.row_of:
+            return []
+        query_weights = tf * self.idf[features]
+        query_norm = np.linalg.norm(query_weights)
+
+        # Postings of the query's features in the sorted segment, gathered in one go
+        sorted_features = self.features[:self.sorted_count]
+        lo = np.searchsorted(sorted_features, features, 'left')
+        counts = np.searchsorted(sorted_features, features, 'right') - lo
+        offsets = np.repeat(lo - np.concatenate(([0], np.cumsum(counts)[:-1])), counts)
+        entries = np.arange(counts.sum()) + offsets
+        contributions = self.weights[entries] * np.repeat(query_weights, counts)
+        dots = np.bincount(self.rows[entries], weights=contributions,
+                           minlength=len(self.post_ids)).astype(np.float64, copy=False)
+
+        # The unsorted tail is small; scan it whole
+        if self.sorted_count < len(self.features):
+            query = np.zeros(FEATURES, dtype=np.float32)
+            query[features] = query_weights
+            tail = slice(self.sorted_count, None)
+            dots += np.bincount(self.rows[tail], weights=self.weights[tail] * query[self.features[tail]],
+                                minlength=len(self.post_ids))
+
+        scores = np.where(self.alive & (self.norms > 0), dots / np.maximum(self.norms * query_norm, 1e-12), 0)
+        for post_id in exclude:
+            row = self.row_of.get(post_id)
+            if row is not None:
+                scores[row] = 0
+        top = np.argpartition(-scores, min(limit, len(scores) - 1))[:limit]
+        top = top[np.argsort(-scores[top])]
+        return [(int(self.post_ids[row]), float(scores[row])) for row in top if scores[row] >= MIN_SIMILARITY]
+
+    def save(self, path):
+        tmp_path = f'{path}.{os.getpid()}.tmp.npz'
+        np.savez(tmp_path, version=FORMAT_VERSION, post_ids=self.post_ids, versions=self.versions,
+                 alive=self.alive, lengths=self.lengths, rows=self.rows, features=self.features, tf=self.tf,
+                 sorted_count=self.sorted_count,
+                 watermark=np.array(self.watermark.isoformat() if self.watermark else ''))
+        os.replace(tmp_path, path)
+        self.dirty = False
+        self.saved_at = time.monotonic()
+
+    @classmethod
+    def load(cls, path):
+        index = cls()
+        with np.load(path) as data:
+            if int(data['version']) != FORMAT_VERSION:
+                return None
+            for name in ('post_ids', 'versions', 'alive', 'lengths', 'rows', 'features', 'tf'):
+                setattr(index, name, data[name])
+            index.sorted_count = int(data['sorted_count'])
+            watermark = str(data['watermark'])
+        index.watermark = datetime.fromisoformat(watermark) if watermark else None
+        index.row_of = {int(post_id): row for row, post_id in enumerate(index.post_ids) if index.alive[row]}
+        index.dead_entries = int(index.lengths[~index.alive].sum())
+        index._refresh_weights()
+        index._maybe_consolidate()
+        index.saved_at = time.monotonic()
+        return index
+
+
+class _UserSlot:
+    """A user's index (loaded on first use) and the lock its lookups hold"""
+    __slots__ = ('lock', 'index')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.index = None
+
+
+class RelatedPostsIndex:
+    def __init__(self, folder=None, max_users: int = 50, save_interval: int = 30):
+        self.folder = folder
+        self.max_users = max_users
+        self.save_interval = save_interval
+        self._slots = OrderedDict()
+        # Guards only the LRU bookkeeping; loading, catching up, searching and
+        # saving hold the user's own lock, so a cold build for one user does
+        # not block lookups for the others
+        self._lock = threading.Lock()
+
+    def _path(self, user_id):
+        return os.path.join(self.folder, f'user-{user_id}.npz')
+
+    def _slot(self, user_id):
+        """The user's slot, most recently used; returns (slot, evicted [(user_id, slot)])"""
+        with self._lock:
+            if self.folder is None:
+                self.configure(current_app.config)
+            slot = self._slots.get(user_id)
+            if slot is None:
+                slot = self._slots[user_id] = _UserSlot()
+            self._slots.move_to_end(user_id)
+            evicted = []
+            while len(self._slots) > self.max_users:
+                evicted.append(self._slots.popitem(last=False))
+            return slot, evicted
+
+    def _load(self, user_id):
+        path = self._path(user_id)
+        try:
+            index = UserRelatedIndex.load(path) if os.path.exists(path) else None
+        except (OSError, ValueError, KeyError) as e:
+            current_app.logger.warning(f"Discarding unreadable related-posts index {path}: {e}")
+            index = None
+        return index or UserRelatedIndex()
+
+    def _save(self, user_id, index):
+        if self.folder:
+            os.makedirs(self.folder, exist_ok=True)
+            index.save(self._path(user_id))
+
+    def _save_slot(self, user_id, slot):
+        with slot.lock:
+            if slot.index is not None and slot.index.dirty:
+                self._save(user_id, slot.index)
+
+    def _catch_up(self, user_id, index):
+        """Index posts changed since the watermark and drop deleted ones"""
+        query = db.session.query(Post.id, Post.title, Post.content, Post.hashtags, Post.updated_at)\
+                          .filter(Post.user_id == user_id)
+        if index.watermark is not None:
+            # >= so posts saved within the same timestamp are never skipped
+            query = query.filter(Post.updated_at >= index.watermark)
+        changed = [row for row in query if not index.is_current(row.id, _version(row.updated_at))]
+        if changed:
+            index.update((row.id, post_text(row.title, row.content, row.hashtags), _version(row.updated_at))
+                         for row in changed)
+            index.watermark = max((row.updated_at for row in changed if row.updated_at), default=index.watermark)
+
+        live_count = db.session.query(db.func.count(Post.id)).filter(Post.user_id == user_id).scalar()
+        if live_count != index.size:
+            live_ids = {post_id for post_id, in db.session.query(Post.id).filter(Post.user_id == user_id)}
+            index.remove([post_id for post_id in list(index.row_of) if post_id not in live_ids])
+
+    def configure(self, config):
+        import atexit
+        self.folder = config['RELATED_INDEX_FOLDER']
+        self.max_users = config.get('RELATED_INDEX_MAX_USERS', 50)
+        self.save_interval = config.get('RELATED_INDEX_SAVE_INTERVAL', 30)
+        atexit.register(self.flush)
+
+    def related(self, user_id, post, limit=5):
+        """[(post_id, similarity)] of the user's posts most similar to ``post``"""
+        slot, evicted = self._slot(user_id)
+        for evicted_user_id, evicted_slot in evicted:
+            self._save_slot(evicted_user_id, evicted_slot)
+
+        with slot.lock:
+            if slot.index is None:
+                slot.index = self._load(user_id)
+            index = slot.index
+            self._catch_up(user_id, index)
+            results = index.similar(post_text(post.title, post.content, post.hashtags), limit, exclude=(post.id,))
+            if index.dirty and time.monotonic() - index.saved_at >= self.save_interval:
+                self._save(user_id, index)
+            return results
+
+    def flush(self):
+        """Persist every index with unsaved changes"""
+        with self._lock:
+            slots = list(self._slots.items())
+        for user_id, slot in slots:
+            self._save_slot(user_id, slot)
+
+
+related_posts_index = RelatedPostsIndex()
+
@@ -0,0 +1,114 @@
+"""
+Opt-in per-request SQL instrumentation for PostForge
+Counts and times SQL statements and template rendering per request, emits a
+Server-Timing header, logs slow statements and warns about N+1 patterns
+"""
+
+import logging
+import re
+import time
+from collections import Counter
+from flask import g, request, has_request_context, before_render_template, template_rendered
+from sqlalchemy import event
+
+slow_query_logger = logging.getLogger('postforge.slow_queries')
+
+_WHITESPACE = re.compile(r'\s+')
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+
+
+def normalize_sql(statement):
+    """Collapse whitespace, literals and expanded IN-lists so equal queries compare equal"""
+    statement = _WHITESPACE.sub(' ', statement).strip()
+    statement = _STRING_LITERAL.sub('?', statement)
+    statement = _NUMBER_LITERAL.sub('?', statement)
+    return _PLACEHOLDER_LIST.sub('(?)', statement)
+
+
+def init_request_timing(app, engine):
+    """Install the instrumentation if SQL_INSTRUMENTATION is enabled"""
+    if not app.config.get('SQL_INSTRUMENTATION'):
+        return
+
+    slow_threshold_ms = app.config['SLOW_QUERY_THRESHOLD_MS']
+    n_plus_one_threshold = app.config['N_PLUS_ONE_THRESHOLD']
+
+    log_file = app.config.get('SLOW_QUERY_LOG_FILE')
+    if log_file and not slow_query_logger.handlers:
+        handler = logging.FileHandler(log_file)
+        handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        slow_query_logger.addHandler(handler)
+        slow_query_logger.setLevel(logging.INFO)
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info['query_start_time'].pop()) * 1000
+        if not has_request_context() or 'request_timing' not in g:
+            return
+
+        timing = g.request_timing
+        timing['db_count'] += 1
+        timing['db_ms'] += elapsed_ms
+        normalized = normalize_sql(statement)
+        timing['statements'][normalized] += 1
+
+        if elapsed_ms >= slow_threshold_ms:
+            slow_query_logger.warning(
+                'slow query %.1fms endpoint=%s path=%s sql=%s',
+                elapsed_ms, request.endpoint, request.path, normalized
+            )
+
+    def on_before_render(sender, template, context, **extra):
+        if 'request_timing' in g:
+            g.request_timing['template_starts'].append(time.perf_counter())
+
+    def on_rendered(sender, template, context, **extra):
+        if 'request_timing' in g and g.request_timing['template_starts']:
+            start = g.request_timing['template_starts'].pop()
+            # Only count the outermost render so nested render_template calls aren't doubled
+            if not g.request_timing['template_starts']:
+                g.request_timing['template_ms'] += (time.perf_counter() - start) * 1000
+
+    before_render_template.connect(on_before_render, app, weak=False)
+    template_rendered.connect(on_rendered, app, weak=False)
+
+    @app.before_request
+    def start_request_timing():
+        g.request_timing = {
+            'start': time.perf_counter(),
+            'db_count': 0,
+            'db_ms': 0.0,
+            'template_ms': 0.0,
+            'template_starts': [],
+            'statements': Counter()
+        }
+
+    @app.after_request
+    def add_server_timing(response):
+        timing = g.pop('request_timing', None)
+        if timing is None:
+            return response
+
+        total_ms = (time.perf_counter() - timing['start']) * 1000
+        response.headers.add(
+            'Server-Timing',
+            f'db;dur={timing["db_ms"]:.1f};desc="{timing["db_count"]} queries", '
+            f'tpl;dur={timing["template_ms"]:.1f}, '
+            f'total;dur={total_ms:.1f}'
+        )
+
+        if app.debug and timing['statements']:
+            statement, count = timing['statements'].most_common(1)[0]
+            if count >= n_plus_one_threshold:
+                app.logger.warning(
+                    'Possible N+1 query on %s: statement ran %d times: %s',
+                    request.endpoint, count, statement
+                )
+
+        return response
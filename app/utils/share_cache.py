@@ -0,0 +1,93 @@
+"""
+Per-process cache of rendered public share pages
+Each entry holds the HTML of posts/public_view.html for one share token,
+tagged with the post's updated_at. Every request still looks up the token's
+(id, updated_at) - a single indexed row - so edits, image changes and
+disabling sharing (all of which bump updated_at) take effect immediately
+in every worker; stale entries are simply not matched and get replaced.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Optional
+from flask import make_response, render_template, request
+from sqlalchemy import event
+from sqlalchemy.orm import selectinload
+from app import db
+from app.models.post import Post
+from app.utils.compression import if_none_match
+
+
+class SharePageCache:
+    def __init__(self, max_entries: int = 500):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str, version: datetime) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(token)
+            return entry[1]
+
+    def put(self, token: str, version: datetime, html: str):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[token] = (version, html)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token: str):
+        with self._lock:
+            self._entries.pop(token, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+share_page_cache = SharePageCache()
+
+
+def share_etag(post_id: int, updated_at: datetime) -> str:
+    return f'share-{post_id}-{updated_at.strftime("%Y%m%d%H%M%S%f")}'
+
+
+def share_page_response(token: str):
+    """Rendered public_view.html for ``token``, from cache or 304 when possible"""
+    row = db.session.query(Post.id, Post.updated_at).filter_by(share_token=token, is_shared=True).first_or_404()
+    etag = share_etag(row.id, row.updated_at)
+
+    modified_since = request.if_modified_since
+    if if_none_match(etag) or (
+        not request.if_none_match and modified_since
+        and row.updated_at.replace(microsecond=0, tzinfo=timezone.utc) <= modified_since
+    ):
+        response = make_response('', 304)
+    else:
+        html = share_page_cache.get(token, row.updated_at)
+        if html is None:
+            post = Post.query.options(selectinload(Post.images)).get(row.id)
+            html = render_template('posts/public_view.html', post=post)
+            share_page_cache.put(token, row.updated_at, html)
+        response = make_response(html)
+
+    # Revalidate every time so edits and disabled sharing show up at once
+    response.set_etag(etag)
+    response.last_modified = row.updated_at
+    response.cache_control.public = True
+    response.cache_control.no_cache = True
+    return response
+
+
+# Frees memory in this worker right away; correctness comes from the version check
+@event.listens_for(Post, 'after_update')
+@event.listens_for(Post, 'after_delete')
+def _invalidate_share_page(mapper, connection, target):
+    if target.share_token:
+        share_page_cache.invalidate(target.share_token)
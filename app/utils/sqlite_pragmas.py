@@ -0,0 +1,49 @@
+"""
+SQLite connection tuning for PostForge
+Applies the configured PRAGMAs to every new DB-API connection so concurrent
+gunicorn workers can read while another one writes
+"""
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+# busy_timeout goes first so switching the journal mode waits for other writers
+PRAGMA_ORDER = ['busy_timeout', 'journal_mode', 'synchronous', 'cache_size', 'mmap_size', 'temp_store']
+
+# QueuePool sizing; in-memory SQLite uses SingletonThreadPool/StaticPool, which reject them
+QUEUE_POOL_OPTIONS = ('pool_size', 'max_overflow', 'pool_timeout')
+
+
+def is_memory_sqlite(uri):
+    url = make_url(uri)
+    return url.get_backend_name() == 'sqlite' and (
+        url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory'
+    )
+
+
+def engine_options(uri, options):
+    """SQLALCHEMY_ENGINE_OPTIONS for `uri`, without the pool sizing its pool class does not accept"""
+    options = dict(options or {})
+    if is_memory_sqlite(uri):
+        for name in QUEUE_POOL_OPTIONS:
+            options.pop(name, None)
+    return options
+
+
+def register_sqlite_pragmas(engine, pragmas):
+    """Register a connect hook that sets `pragmas` on each new SQLite connection"""
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+
+    ordered = sorted(pragmas.items(), key=lambda item: PRAGMA_ORDER.index(item[0]) if item[0] in PRAGMA_ORDER else len(PRAGMA_ORDER))
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in ordered:
+                if value is None:
+                    continue
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
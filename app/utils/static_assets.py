@@ -0,0 +1,94 @@
+"""
+Content-hashed static assets.
+
+``build_assets.py`` copies the front-end assets to ``static/dist`` under
+names that include a hash of their content and writes a manifest mapping
+the plain name to the hashed one. Templates link assets through
+``static_url('css/app.css')``; since a changed file gets a new URL, the
+hashed files are served with a one-year ``immutable`` Cache-Control and
+browsers never revalidate them.
+
+Without a manifest (and always in debug mode, so edits show up
+immediately) ``static_url`` falls back to the plain file with its mtime as
+a cache-busting query parameter.
+"""
+import hashlib
+import json
+import os
+import shutil
+
+from flask import request, url_for
+
+DIST_DIR = 'dist'
+MANIFEST_FILENAME = 'manifest.json'
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+# Assets referenced from templates, relative to the static folder
+ASSETS = [
+    'css/app.css',
+    'js/alpine-components.js',
+    'js/vendor/alpinejs.min.js',
+    'js/vendor/htmx.min.js',
+]
+
+
+def hashed_filename(name, data, length=12):
+    base, ext = os.path.splitext(name)
+    return f'{base}.{hashlib.sha256(data).hexdigest()[:length]}{ext}'
+
+
+def build_manifest(static_folder, assets=ASSETS):
+    """Copy ``assets`` to ``dist/`` under content-hashed names; return the manifest"""
+    dist_folder = os.path.join(static_folder, DIST_DIR)
+    shutil.rmtree(dist_folder, ignore_errors=True)
+
+    manifest = {}
+    for name in assets:
+        with open(os.path.join(static_folder, name), 'rb') as f:
+            data = f.read()
+        hashed = hashed_filename(name, data)
+        target = os.path.join(dist_folder, hashed)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            f.write(data)
+        manifest[name] = f'{DIST_DIR}/{hashed}'
+
+    with open(os.path.join(dist_folder, MANIFEST_FILENAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def load_manifest(static_folder):
+    try:
+        with open(os.path.join(static_folder, DIST_DIR, MANIFEST_FILENAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def init_static_assets(app):
+    """Register the ``static_url()`` template helper and immutable caching"""
+    manifest = {} if app.debug else load_manifest(app.static_folder)
+    if not manifest and not app.debug:
+        app.logger.info('No static asset manifest found; run build_assets.py for cache-busted URLs')
+
+    @app.template_global()
+    def static_url(name):
+        hashed = manifest.get(name)
+        if hashed:
+            return url_for('static', filename=hashed)
+        try:
+            version = int(os.path.getmtime(os.path.join(app.static_folder, name)))
+        except OSError:
+            return url_for('static', filename=name)
+        return url_for('static', filename=name, v=version)
+
+    @app.after_request
+    def cache_hashed_assets(response):
+        filename = (request.view_args or {}).get('filename', '')
+        if request.endpoint == 'static' and filename.startswith(f'{DIST_DIR}/') and response.status_code in (200, 304):
+            response.cache_control.public = True
+            response.cache_control.max_age = IMMUTABLE_MAX_AGE
+            response.cache_control.immutable = True
+            response.cache_control.no_cache = None
+        return response
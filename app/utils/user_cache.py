@@ -0,0 +1,93 @@
+"""
+Per-process cache of authenticated-user identity data
+Lets the Flask-Login user loader skip the users SELECT on most requests.
+Entries are dropped whenever a User row is updated or deleted in this
+process; other workers pick up changes once the TTL expires.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from flask_login import UserMixin
+from sqlalchemy import event
+from app.models.user import User
+
+
+class CachedUser(UserMixin):
+    """Read-only identity of the logged-in user, detached from any DB session"""
+
+    def __init__(self, id: int, username: str, email: str):
+        self.id = id
+        self.username = username
+        self.email = email
+
+    @classmethod
+    def from_user(cls, user: User) -> 'CachedUser':
+        return cls(user.id, user.username, user.email)
+
+    def __repr__(self):
+        return f'<CachedUser {self.username}>'
+
+
+class UserIdentityCache:
+    def __init__(self, ttl: int = 60, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[CachedUser]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            identity, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return identity
+
+    def put(self, identity: CachedUser):
+        with self._lock:
+            self._entries[identity.id] = (identity, time.monotonic() + self.ttl)
+            self._entries.move_to_end(identity.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_identity_cache = UserIdentityCache()
+
+
+def load_user_identity(user_id: int):
+    """Return the cached identity for `user_id`, loading it from the database on a miss"""
+    if user_identity_cache.ttl <= 0:
+        return User.query.get(user_id)
+
+    identity = user_identity_cache.get(user_id)
+    if identity is not None:
+        return identity
+
+    user = User.query.get(user_id)
+    if user is None:
+        return None
+
+    identity = CachedUser.from_user(user)
+    user_identity_cache.put(identity)
+    return identity
+
+
+# Password changes, account edits and deletions all go through the ORM
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _invalidate_user(mapper, connection, target):
+    user_identity_cache.invalidate(target.id)
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for PostForge
+Drives the main routes through the Flask test client against a seeded
+database (see seed_db.py) and reports latency percentiles and throughput as
+JSON, so results can be diffed between commits.
+
+    DATABASE_URL=sqlite:////tmp/postforge_bench.db python seed_db.py
+    DATABASE_URL=sqlite:////tmp/postforge_bench.db python benchmark.py --output bench.json
+    DATABASE_URL=sqlite:////tmp/postforge_bench.db python benchmark.py --baseline bench.json
+
+The write scenarios (upload, import) add rows for the benchmark user and run
+last; uploaded files and export archives go to a temporary directory.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from datetime import datetime
+
+# Add the project directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app, db
+from app.models import User, Post, Image
+from app.utils.posts_manifest import MANIFEST_FILENAME, MANIFEST_FORMAT, MANIFEST_VERSION
+
+SEARCH_TERMS = ['team', 'cloud', 'innovation', 'daten', '#ai', 'zukunft', 'xyz-no-match']
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _small_png():
+    from PIL import Image as PILImage
+    buffer = io.BytesIO()
+    PILImage.new('RGB', (640, 480), (37, 99, 235)).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def _import_zip(posts=50):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        lines = [json.dumps({'format': MANIFEST_FORMAT, 'version': MANIFEST_VERSION})]
+        for i in range(posts):
+            lines.append(json.dumps({
+                'title': f'Benchmark import {i}',
+                'content': f'Importierter Benchmark-Post {i} #ai #benchmark',
+                'hashtags': '#ai #benchmark',
+                'notes': None,
+                'engagement_stats': '10 Likes, 2 Kommentare',
+                'images': []
+            }))
+        zipf.writestr(MANIFEST_FILENAME, '\n'.join(lines) + '\n')
+    return buffer.getvalue()
+
+
+class BenchmarkContext:
+    def __init__(self, app, username, password, workdir):
+        self.app = app
+        self.workdir = workdir
+        self.rng = random.Random(1234)
+
+        self.client = app.test_client()
+        response = self.client.post('/login', data={'username': username, 'password': password})
+        if response.status_code != 302:
+            raise RuntimeError(f'Login as {username} failed')
+        self.anonymous = app.test_client()
+
+        with app.app_context():
+            user = User.query.filter_by(username=username).first()
+            self.user_id = user.id
+            self.post_ids = [row.id for row in db.session.query(Post.id).filter_by(user_id=user.id).limit(1000)]
+            self.share_tokens = [row.share_token for row in db.session.query(Post.share_token).filter(Post.is_shared.is_(True)).limit(100)]
+            self.post_count = Post.query.filter_by(user_id=user.id).count()
+            self.dataset = {
+                'users': User.query.count(),
+                'posts': Post.query.count(),
+                'images': Image.query.count(),
+                'user_posts': self.post_count
+            }
+
+        if not self.post_ids:
+            raise RuntimeError(f'{username} has no posts; seed the database first')
+
+        self.png = _small_png()
+        self.import_zip = _import_zip()
+        self.importer = self._pdf_import_client(username, password)
+
+    def _pdf_import_client(self, username, password, posts=6):
+        """Client whose session holds a parsed PDF, as /upload/import leaves it for /upload/preview
+
+        Half of the posts are lightly edited copies of library posts, so the
+        preview's near-duplicate lookup has matches to load. A separate client
+        keeps the large session cookie off the other scenarios' requests.
+        """
+        client = self.app.test_client()
+        client.post('/login', data={'username': username, 'password': password})
+        with self.app.app_context():
+            sample = self.rng.sample(self.post_ids, min(posts // 2, len(self.post_ids)))
+            copies = [row.content for row in db.session.query(Post.content).filter(Post.id.in_(sample))]
+        contents = [f'{content} Heute noch einmal geteilt.' for content in copies]
+        contents += [f'Neuer PDF-Post {i} über Teamkultur und Weiterbildung #benchmark' for i in range(posts - len(contents))]
+        with client.session_transaction() as session:
+            session['parsed_posts'] = [
+                {'title': f'PDF-Post {i}', 'content': content, 'hashtags': '#benchmark', 'date': '', 'engagement': ''}
+                for i, content in enumerate(contents)
+            ]
+            session['pdf_filename'] = 'benchmark.pdf'
+        return client
+
+    def wait_for_export(self):
+        """Start an export and poll until the archive is ready"""
+        from app.utils.export_jobs import ExportJobManager, export_fingerprint
+        response = self.client.post('/export-import/export')
+        with self.app.app_context():
+            manager = ExportJobManager(
+                self.app.config['EXPORT_CACHE_FOLDER'], self.app.config['EXPORT_CACHE_TTL'],
+                self.app.config['IMAGE_UPLOAD_FOLDER']
+            )
+            job_id = export_fingerprint(self.user_id)
+        while True:
+            job = manager.get_job(job_id)
+            if job is None or job['state'] in ('done', 'failed'):
+                break
+            time.sleep(0.05)
+        if job is None or job['state'] != 'done':
+            response.status_code = 500
+            return response
+        return self.client.get(f'/export-import/export/{job_id}/download')
+
+    def clear_export_cache(self):
+        shutil.rmtree(self.app.config['EXPORT_CACHE_FOLDER'], ignore_errors=True)
+        os.makedirs(self.app.config['EXPORT_CACHE_FOLDER'], exist_ok=True)
+
+
+def _scenarios(ctx):
+    """(name, callable) pairs; read-only scenarios first, writes last"""
+    pages = max(1, (ctx.post_count + 9) // 10)
+    return [
+        ('dashboard', lambda: ctx.client.get('/')),
+        ('post_list', lambda: ctx.client.get(f'/posts/?page={ctx.rng.randint(1, min(pages, 50))}')),
+        ('post_list_status_filter', lambda: ctx.client.get(f'/posts/?status_filter=posted&page={ctx.rng.randint(1, 5)}')),
+        ('search', lambda: ctx.client.get(f'/posts/?query={ctx.rng.choice(SEARCH_TERMS)}')),
+        ('search_suggest', lambda: ctx.client.get(f'/posts/search?q={ctx.rng.choice(SEARCH_TERMS)}')),
+        ('post_edit', lambda: ctx.client.get(f'/posts/{ctx.rng.choice(ctx.post_ids)}/edit')),
+        ('post_images', lambda: ctx.client.get(f'/posts/{ctx.rng.choice(ctx.post_ids)}/images')),
+        ('preview', lambda: ctx.importer.get('/upload/preview')),
+        ('public_view', lambda: ctx.anonymous.get(f'/posts/shared/{ctx.rng.choice(ctx.share_tokens)}') if ctx.share_tokens else None),
+        ('export_cached', ctx.wait_for_export),
+        ('export_build', lambda: (ctx.clear_export_cache(), ctx.wait_for_export())[1]),
+        ('upload', lambda: ctx.client.post('/upload/images', data={
+            'post_id': str(ctx.rng.choice(ctx.post_ids)),
+            'images': (io.BytesIO(ctx.png), 'benchmark.png', 'image/png')
+        }, content_type='multipart/form-data')),
+        ('import', lambda: ctx.client.post('/export-import/import', data={
+            'zip_file': (io.BytesIO(ctx.import_zip), 'benchmark.zip')
+        }, content_type='multipart/form-data')),
+    ]
+
+
+def run_scenario(action, iterations, warmup):
+    for _ in range(warmup):
+        action()
+
+    # Only 2xx/3xx responses are timed; a fast error page would skew the percentiles
+    latencies = []
+    errors = 0
+    status_codes = {}
+    started = time.perf_counter()
+    for _ in range(iterations):
+        request_start = time.perf_counter()
+        response = action()
+        duration_ms = (time.perf_counter() - request_start) * 1000
+        if response is None:
+            return None
+        status_codes[str(response.status_code)] = status_codes.get(str(response.status_code), 0) + 1
+        if response.status_code >= 400:
+            errors += 1
+        else:
+            latencies.append(duration_ms)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    def stat(value):
+        return round(value, 3) if latencies else None
+
+    return {
+        'requests': iterations,
+        'errors': errors,
+        'status_codes': status_codes,
+        'p50_ms': stat(percentile(latencies, 50)),
+        'p95_ms': stat(percentile(latencies, 95)),
+        'p99_ms': stat(percentile(latencies, 99)),
+        'mean_ms': stat(sum(latencies) / len(latencies) if latencies else None),
+        'max_ms': stat(latencies[-1] if latencies else None),
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed else None
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def print_comparison(results, baseline):
+    print(f"{'scenario':<26}{'p50 ms':>12}{'Δ p50':>9}{'p95 ms':>12}{'Δ p95':>9}")
+    for name, stats in results['scenarios'].items():
+        old = baseline.get('scenarios', {}).get(name)
+        if stats['p50_ms'] is None:
+            print(f"{name:<26}{'failed':>12}")
+            continue
+        row = f"{name:<26}{stats['p50_ms']:>12.2f}"
+        if old and old.get('p50_ms'):
+            row += f"{(stats['p50_ms'] / old['p50_ms'] - 1) * 100:>+8.1f}%"
+        else:
+            row += f"{'':>9}"
+        row += f"{stats['p95_ms']:>12.2f}"
+        if old and old.get('p95_ms'):
+            row += f"{(stats['p95_ms'] / old['p95_ms'] - 1) * 100:>+8.1f}%"
+        print(row)
+
+
+def run_benchmarks(username, password, iterations, warmup, only=None, config_name='development'):
+    workdir = tempfile.mkdtemp(prefix='postforge_bench_')
+    app = create_app(config_name)
+    app.config['WTF_CSRF_ENABLED'] = False
+    # Count unhandled exceptions as 500s instead of aborting the run
+    app.config['PROPAGATE_EXCEPTIONS'] = False
+    app.config['IMAGE_UPLOAD_FOLDER'] = os.path.join(workdir, 'images')
+    app.config['EXPORT_CACHE_FOLDER'] = os.path.join(workdir, 'exports')
+    os.makedirs(app.config['IMAGE_UPLOAD_FOLDER'])
+    os.makedirs(app.config['EXPORT_CACHE_FOLDER'])
+
+    try:
+        ctx = BenchmarkContext(app, username, password, workdir)
+        results = {
+            'meta': {
+                'timestamp': datetime.now().isoformat(),
+                'git_commit': _git_commit(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'iterations': iterations,
+                'warmup': warmup,
+                'user': username,
+                'dataset': ctx.dataset
+            },
+            'scenarios': {}
+        }
+
+        for name, action in _scenarios(ctx):
+            if only and name not in only:
+                continue
+            # Exports are slow by nature; a few runs are enough
+            runs = min(iterations, 3) if name.startswith('export') else iterations
+            stats = run_scenario(action, runs, 0 if name in ('upload', 'import', 'export_build') else warmup)
+            if stats is None:
+                print(f"⚠️  {name}: skipped (no data)", file=sys.stderr)
+                continue
+            results['scenarios'][name] = stats
+            if stats['p50_ms'] is None:
+                print(f"❌ {name}: all {stats['requests']} requests failed {stats['status_codes']}", file=sys.stderr)
+                continue
+            print(f"📊 {name:<26} p50 {stats['p50_ms']:>9.2f}ms  p95 {stats['p95_ms']:>9.2f}ms  "
+                  f"p99 {stats['p99_ms']:>9.2f}ms  {stats['throughput_rps']:>8.1f} req/s  errors {stats['errors']}",
+                  file=sys.stderr)
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--user', default='bench_user_0')
+    parser.add_argument('--password', default='benchmark')
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--scenarios', help='comma-separated subset of scenarios to run')
+    parser.add_argument('--output', help='write JSON results to this file (default: stdout)')
+    parser.add_argument('--baseline', help='JSON results of a previous run to compare against')
+    parser.add_argument('--config', default=os.getenv('FLASK_CONFIG', 'development'))
+    args = parser.parse_args()
+
+    only = set(args.scenarios.split(',')) if args.scenarios else None
+    results = run_benchmarks(args.user, args.password, args.iterations, args.warmup, only, args.config)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            print_comparison(results, json.load(f))
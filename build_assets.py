@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Static asset build for PostForge
+Copies the CSS/JS assets to app/static/dist under content-hashed names,
+writes the manifest used by static_url() and precompresses the results.
+Run after building the CSS (npm run build-css-prod).
+
+Third-party scripts are committed to app/static/js/vendor at the exact
+versions in VENDOR_ASSETS and checked on every build. A vendored file that is
+missing or differs from the pinned build is downloaded from its source first
+(--no-fetch fails instead, e.g. for offline image builds).
+"""
+
+import argparse
+import base64
+import hashlib
+import os
+import re
+import sys
+import urllib.request
+
+# Add the project directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils.static_assets import build_manifest
+from compress_static import STATIC_DIR, compress_static
+
+# name -> (version, source, integrity); the versions the templates were written
+# against. integrity is the sha384 SRI hash published upstream for that build;
+# where it is None only the embedded version is checked.
+VENDOR_ASSETS = {
+    'js/vendor/alpinejs.min.js': ('3.14.1', 'https://unpkg.com/alpinejs@3.14.1/dist/cdn.min.js', None),
+    'js/vendor/htmx.min.js': ('1.9.10', 'https://unpkg.com/htmx.org@1.9.10/dist/htmx.min.js',
+                              'sha384-D1Kt99CQMDuVetoL1lrYwg5t+9QdHe7NLX/SoJYkXDFfX37iInKRy5xLSi8nO7UC'),
+}
+
+# Both libraries embed their release in the minified build, e.g. version:"1.9.10"
+VERSION_PATTERN = re.compile(rb'version:\s*"([^"]+)"')
+
+
+def vendored_version(data):
+    match = VERSION_PATTERN.search(data)
+    return match.group(1).decode() if match else None
+
+
+def sri_hash(data):
+    return 'sha384-' + base64.b64encode(hashlib.sha384(data).digest()).decode()
+
+
+def vendor_problem(data, version, integrity):
+    """Why ``data`` is not the pinned build, or None if it is"""
+    if data is None:
+        return 'missing'
+    if vendored_version(data) != version:
+        return f"version {vendored_version(data)}"
+    if integrity and sri_hash(data) != integrity:
+        return f"modified ({sri_hash(data)})"
+    return None
+
+
+def vendor_assets(static_dir=STATIC_DIR, fetch=True):
+    """Make sure every vendored script is the pinned build; returns False if one is not"""
+    ok = True
+    for name, (version, source, integrity) in sorted(VENDOR_ASSETS.items()):
+        path = os.path.join(static_dir, name)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            data = None
+        problem = vendor_problem(data, version, integrity)
+        if problem is None:
+            print(f"📦 {name} {version}")
+            continue
+
+        if not fetch:
+            print(f"❌ {name} is {problem}, expected {version} from {source}")
+            ok = False
+            continue
+        try:
+            with urllib.request.urlopen(source, timeout=30) as response:
+                data = response.read()
+        except OSError as e:
+            print(f"❌ Could not download {name} {version} from {source}: {e}")
+            ok = False
+            continue
+        problem = vendor_problem(data, version, integrity)
+        if problem is not None:
+            print(f"❌ {source} is {problem}, expected {version}")
+            ok = False
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+        print(f"📥 {name} {version} downloaded from {source}")
+    return ok
+
+
+def build_assets(static_dir=STATIC_DIR, compress=True, fetch=True):
+    if not vendor_assets(static_dir, fetch):
+        return None
+
+    manifest = build_manifest(static_dir)
+    for name, hashed in sorted(manifest.items()):
+        print(f"🔖 {name} -> {hashed}")
+    print(f"✅ Wrote manifest with {len(manifest)} assets")
+
+    if compress:
+        compress_static(static_dir)
+    return manifest
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build content-hashed static assets')
+    parser.add_argument('--static-dir', default=STATIC_DIR)
+    parser.add_argument('--no-compress', action='store_true', help='skip writing .gz/.br variants')
+    parser.add_argument('--no-fetch', action='store_true', help='fail instead of downloading missing vendored scripts')
+    args = parser.parse_args()
+
+    manifest = build_assets(args.static_dir, compress=not args.no_compress, fetch=not args.no_fetch)
+    sys.exit(0 if manifest is not None else 1)
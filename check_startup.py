@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Startup import-time check for PostForge
+Runs create_app() (or create_share_app() with --target share) in a fresh
+interpreter under `python -X importtime` and fails if startup exceeds the
+budget or eagerly imports modules that should only be loaded on first use
+(PDF parsing and imaging libraries; for the share server also migrations,
+forms and i18n)
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+DEFAULT_BUDGET_MS = 1500
+
+# Modules that must not be imported just by creating the app
+LAZY_MODULES = ['PyPDF2', 'pdfplumber', 'pdfminer', 'PIL', 'numpy']
+
+# target -> (module, factory, extra modules the factory must not import)
+TARGETS = {
+    'main': ('app', 'create_app', []),
+    'share': ('app.share_app', 'create_share_app', ['flask_migrate', 'alembic', 'flask_wtf', 'flask_babel', 'prometheus_client'])
+}
+
+CHILD_SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+from {module} import {factory}
+{factory}({config!r})
+elapsed_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({{
+    'elapsed_ms': elapsed_ms,
+    'loaded': [name for name in {lazy_modules!r} if name in sys.modules]
+}}))
+'''
+
+
+def parse_importtime(stderr):
+    """Return [(cumulative_us, module)] for top-level imports from -X importtime output"""
+    top_level = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line.split('|', 2)
+        # Nested imports are indented below their parent
+        if len(name) - len(name.lstrip()) > 1:
+            continue
+        top_level.append((int(cumulative_us), name.strip()))
+    return top_level
+
+
+def check_startup(budget_ms, config_name='default', top=10, target='main'):
+    project_dir = os.path.dirname(os.path.abspath(__file__))
+    module, factory, extra_lazy = TARGETS[target]
+    script = CHILD_SCRIPT.format(
+        module=module, factory=factory, config=config_name, lazy_modules=LAZY_MODULES + extra_lazy
+    )
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', script],
+        cwd=project_dir, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(result.stderr)
+        print(f"❌ {factory}() failed")
+        return False
+
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    imports = sorted(parse_importtime(result.stderr), reverse=True)
+    import_ms = sum(us for us, _ in imports) / 1000
+
+    print(f"📊 {factory}() startup: {report['elapsed_ms']:.0f}ms (imports: {import_ms:.0f}ms, budget: {budget_ms}ms)")
+    print("📊 Slowest top-level imports:")
+    for cumulative_us, name in imports[:top]:
+        print(f"   {cumulative_us / 1000:8.1f}ms  {name}")
+
+    ok = True
+    if report['loaded']:
+        print(f"❌ Heavy modules imported at startup: {', '.join(report['loaded'])}")
+        ok = False
+    if report['elapsed_ms'] > budget_ms:
+        print(f"❌ Startup exceeds budget by {report['elapsed_ms'] - budget_ms:.0f}ms")
+        ok = False
+
+    if ok:
+        print("✅ Startup within budget")
+    return ok
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--budget-ms', type=int, default=int(os.getenv('STARTUP_BUDGET_MS', DEFAULT_BUDGET_MS)))
+    parser.add_argument('--config', default=os.getenv('FLASK_CONFIG', 'default'))
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--target', choices=sorted(TARGETS), default='main', help='main app or standalone share server')
+    args = parser.parse_args()
+
+    sys.exit(0 if check_startup(args.budget_ms, args.config, args.top, args.target) else 1)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Static asset precompression for PostForge
+Writes maximum-compression .gz and .br siblings for the CSS/JS/SVG files in
+app/static so they are served without compressing per request. Run after
+building the CSS (npm run build-css-prod); uploads are skipped.
+"""
+
+import argparse
+import gzip
+import os
+import sys
+
+# Add the project directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils.compression import brotli
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app', 'static')
+EXTENSIONS = ('.css', '.js', '.svg', '.json', '.map', '.txt', '.html')
+SKIP_DIRS = {'uploads'}
+MIN_SIZE = 500
+
+
+def _write_if_smaller(path, original_size, data):
+    # A variant that isn't smaller than the source is never worth serving
+    if len(data) >= original_size:
+        if os.path.exists(path):
+            os.remove(path)
+        return False
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
+
+
+def compress_static(static_dir=STATIC_DIR, min_size=MIN_SIZE):
+    if brotli is None:
+        print("⚠️  Brotli not installed, writing .gz variants only")
+
+    count = 0
+    for root, dirs, files in os.walk(static_dir):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for name in sorted(files):
+            if not name.endswith(EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            with open(path, 'rb') as f:
+                data = f.read()
+            if len(data) < min_size:
+                continue
+
+            written = []
+            if _write_if_smaller(path + '.gz', len(data), gzip.compress(data, compresslevel=9, mtime=0)):
+                written.append(f"gz {os.path.getsize(path + '.gz')}")
+            if brotli is not None and _write_if_smaller(path + '.br', len(data), brotli.compress(data, quality=11)):
+                written.append(f"br {os.path.getsize(path + '.br')}")
+            if written:
+                count += 1
+                print(f"📦 {os.path.relpath(path, static_dir)}: {len(data)} bytes -> {', '.join(written)}")
+
+    print(f"✅ Precompressed {count} static files")
+    return count
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Precompress static assets (.gz/.br)')
+    parser.add_argument('--static-dir', default=STATIC_DIR)
+    parser.add_argument('--min-size', type=int, default=MIN_SIZE, help='skip files smaller than this (bytes)')
+    args = parser.parse_args()
+
+    compress_static(args.static_dir, args.min_size)
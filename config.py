@@ -6,6 +6,25 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or f'sqlite:///{os.path.join(os.getcwd(), "instance", "linkedin_posts.db")}'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Database Engine / Pool Configuration
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_pre_ping': True,
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 3600))
+    }
+    
+    # SQLite PRAGMAs applied to every new connection (ignored for other databases)
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000)),  # ms
+        'cache_size': -16000,  # negative = KiB, ~16MB page cache per connection
+        'mmap_size': 64 * 1024 * 1024,
+        'temp_store': 'MEMORY'
+    }
+    
     # Upload Configuration
     UPLOAD_FOLDER = os.path.join(os.getcwd(), 'app', 'static', 'uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file upload
@@ -16,16 +35,88 @@ class Config:
     SESSION_COOKIE_HTTPONLY = True
     SESSION_COOKIE_SAMESITE = 'Lax'
     
+    # Seconds the logged-in user's identity is cached per worker (0 disables)
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 60))
+    
+    # Rendered public share pages cached per worker (0 disables)
+    SHARE_CACHE_MAX_ENTRIES = int(os.environ.get('SHARE_CACHE_MAX_ENTRIES', 500))
+    # Database the standalone share server (share_wsgi.py) reads from; defaults to DATABASE_URL
+    SHARE_DATABASE_URL = os.environ.get('SHARE_DATABASE_URL')
+    
+    # Rendered post cards cached per worker, capped by total HTML size (0 disables)
+    FRAGMENT_CACHE_MAX_BYTES = int(os.environ.get('FRAGMENT_CACHE_MAX_BYTES', 8 * 1024 * 1024))
+    
+    # Cached query results (dashboard stats, search suggestions, image lists).
+    # Without a shared backend, other workers' writes show up after the TTL.
+    QUERY_CACHE_MAX_ENTRIES = int(os.environ.get('QUERY_CACHE_MAX_ENTRIES', 2000))
+    QUERY_CACHE_TTL = int(os.environ.get('QUERY_CACHE_TTL', 30))  # seconds, 0 disables
+    QUERY_CACHE_BACKEND = os.environ.get('QUERY_CACHE_BACKEND', '')  # '', 'memory' or redis:// URL
+    
+    # Per-user hashtag autocomplete indexes: total tags kept per worker before
+    # evicting users, and seconds before an index is rebuilt from the database
+    HASHTAG_SUGGEST_MAX_TAGS = int(os.environ.get('HASHTAG_SUGGEST_MAX_TAGS', 200000))
+    HASHTAG_SUGGEST_TTL = int(os.environ.get('HASHTAG_SUGGEST_TTL', 300))
+    
     # PDF Processing
     PDF_UPLOAD_FOLDER = os.path.join(os.getcwd(), 'app', 'static', 'uploads', 'pdfs')
     IMAGE_UPLOAD_FOLDER = os.path.join(os.getcwd(), 'app', 'static', 'uploads', 'images')
     
+    # Per-request SQL instrumentation (Server-Timing header, slow-query log)
+    SQL_INSTRUMENTATION = os.environ.get('SQL_INSTRUMENTATION', 'False').lower() == 'true'
+    SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', 100))
+    SLOW_QUERY_LOG_FILE = os.environ.get('SLOW_QUERY_LOG_FILE')  # defaults to the app log
+    N_PLUS_ONE_THRESHOLD = int(os.environ.get('N_PLUS_ONE_THRESHOLD', 10))  # dev-mode warning
+    
+    # On-demand request profiling (admin only)
+    PROFILE_FOLDER = os.environ.get('PROFILE_FOLDER') or os.path.join(os.getcwd(), 'instance', 'profiles')
+    PROFILE_MAX_FILES = int(os.environ.get('PROFILE_MAX_FILES', 50))
+    
+    # Worker memory diagnostics (tracemalloc snapshots)
+    MEMORY_SNAPSHOT_FOLDER = os.environ.get('MEMORY_SNAPSHOT_FOLDER') or os.path.join(os.getcwd(), 'instance', 'memory_snapshots')
+    MEMORY_SNAPSHOT_MAX_FILES = int(os.environ.get('MEMORY_SNAPSHOT_MAX_FILES', 20))
+    
+    # Uploaded media: hand file transfers to the front proxy after the access
+    # check ('nginx' = X-Accel-Redirect, 'sendfile' = X-Sendfile, unset = Flask)
+    MEDIA_ACCEL = os.environ.get('MEDIA_ACCEL') or None
+    MEDIA_ACCEL_PREFIX = os.environ.get('MEDIA_ACCEL_PREFIX', '/protected-media/images/')
+    
+    # Response compression (gzip/Brotli) for dynamic responses
+    COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'True').lower() == 'true'
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 500))  # bytes
+    COMPRESSION_GZIP_LEVEL = int(os.environ.get('COMPRESSION_GZIP_LEVEL', 6))
+    COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 5))
+    
+    # Metrics (/metrics is available to admins, or with this bearer token)
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    
+    # Export Jobs
+    EXPORT_CACHE_FOLDER = os.environ.get('EXPORT_CACHE_FOLDER') or os.path.join(os.getcwd(), 'instance', 'exports')
+    EXPORT_CACHE_TTL = int(os.environ.get('EXPORT_CACHE_TTL', 24 * 60 * 60))  # seconds a finished export is kept
+    
+    # Persisted per-user TF-IDF indexes for "related posts" in the editor
+    RELATED_INDEX_FOLDER = os.environ.get('RELATED_INDEX_FOLDER') or os.path.join(os.getcwd(), 'instance', 'related_index')
+    RELATED_INDEX_MAX_USERS = int(os.environ.get('RELATED_INDEX_MAX_USERS', 50))  # indexes kept in memory per worker
+    RELATED_INDEX_SAVE_INTERVAL = int(os.environ.get('RELATED_INDEX_SAVE_INTERVAL', 30))  # seconds between writes
+    
 class DevelopmentConfig(Config):
     DEBUG = True
     
 class ProductionConfig(Config):
     DEBUG = False
-    SESSION_COOKIE_SECURE = True
+    SESSION_COOKIE_SECURE = os.environ.get('SESSION_COOKIE_SECURE', 'True').lower() == 'true'
+    
+    SQLALCHEMY_ENGINE_OPTIONS = dict(
+        Config.SQLALCHEMY_ENGINE_OPTIONS,
+        pool_size=int(os.environ.get('DB_POOL_SIZE', 10)),
+        max_overflow=int(os.environ.get('DB_MAX_OVERFLOW', 20))
+    )
+    
+    SQLITE_PRAGMAS = dict(
+        Config.SQLITE_PRAGMAS,
+        busy_timeout=int(os.environ.get('SQLITE_BUSY_TIMEOUT', 15000)),
+        cache_size=-64000,  # ~64MB
+        mmap_size=256 * 1024 * 1024
+    )
 
 config = {
     'development': DevelopmentConfig,
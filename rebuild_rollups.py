@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Rebuild the analytics rollups of PostForge
+The per-month and per-hashtag rollups behind the dashboard and analytics pages
+are kept current by the Post events. Rebuild them after writing posts,
+hashtags or metrics outside the app (bulk SQL, restores) or to repair drift.
+
+    python rebuild_rollups.py
+    python rebuild_rollups.py --user alice
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add the project directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app, db
+from app.models import User
+from app.models.analytics_rollup import rebuild_rollups as rebuild
+from app.utils.bootstrap import bootstrap_application
+from app.utils.query_cache import query_cache
+
+
+def rebuild_rollups(username=None, config_name='development'):
+    """Recompute the rollups of one user or of every user"""
+    app = create_app(config_name)
+
+    with app.app_context():
+        # Creates the rollup tables on databases that predate them
+        if not bootstrap_application():
+            return False
+
+        user_id = None
+        if username:
+            user = User.query.filter_by(username=username).first()
+            if not user:
+                print(f"❌ User '{username}' not found!")
+                return False
+            user_id = user.id
+
+        print(f"🔄 Rebuilding analytics rollups for {username or 'all users'}...")
+        started = time.perf_counter()
+        months, tags = rebuild(db.session.connection(), user_id)
+        db.session.commit()
+        print(f"✅ {months} month and {tags} hashtag rollups written in {time.perf_counter() - started:.1f}s")
+
+        # With a shared QUERY_CACHE_BACKEND this drops the workers' cached dashboards
+        # right away; otherwise they expire after QUERY_CACHE_TTL seconds
+        user_ids = [user_id] if user_id else [row.id for row in db.session.query(User.id)]
+        query_cache.purge(*(f'user:{uid}' for uid in user_ids))
+        return True
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--user', help='only rebuild the rollups of this username')
+    parser.add_argument('--config', default=os.getenv('FLASK_CONFIG', 'development'))
+    args = parser.parse_args()
+
+    success = rebuild_rollups(args.user, args.config)
+    sys.exit(0 if success else 1)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Benchmark data seeder for PostForge
+Fills the configured database with a large, realistic dataset (users, posts
+with hashtags, statuses and engagement, images, shared posts) for load tests.
+
+    DATABASE_URL=sqlite:////tmp/postforge_bench.db python seed_db.py
+    python seed_db.py --users 10 --posts 20000 --images 50000
+
+Seeded users are named bench_user_<n> and share the password 'benchmark'.
+Image rows reference placeholder filenames; no image files are written.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add the project directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+from app import create_app, db
+from app.models import User, Post, Image
+from app.models.hashtag import backfill_hashtags
+from app.models.post_signature import backfill_signatures
+from app.models.post_metric import backfill_metrics
+from app.models.analytics_rollup import rebuild_rollups
+from app.utils.bootstrap import bootstrap_application
+
+BENCH_USER_PREFIX = 'bench_user_'
+BENCH_PASSWORD = 'benchmark'
+BATCH_SIZE = 5000
+
+WORDS = (
+    'team projekt kunde erfolg innovation daten cloud strategie wachstum lernen '
+    'führung digital zukunft software produkt markt netzwerk karriere erfahrung '
+    'konferenz entwicklung plattform analyse sicherheit automatisierung qualität '
+    'agil prozess ergebnis community feedback idee lösung herausforderung ziel'
+).split()
+
+HASHTAGS = [
+    'ai', 'aiops', 'ml', 'python', 'cloud', 'devops', 'leadership', 'career',
+    'startup', 'innovation', 'data', 'security', 'agile', 'remote', 'hiring',
+    'linkedin', 'marketing', 'sales', 'product', 'design', 'ux', 'kubernetes',
+    'opensource', 'teamwork', 'learning', 'sustainability', 'fintech', 'saas',
+    'analytics', 'automation', 'digitalisierung', 'mittelstand', 'weiterbildung',
+    'networking', 'konferenz', 'webdev', 'javascript', 'flask', 'sql', 'testing'
+]
+
+STATUSES = ['draft', 'posted', 'imported', 'scheduled']
+STATUS_WEIGHTS = [30, 45, 15, 10]
+
+
+def _random_text(rng, min_words, max_words):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words)))
+
+
+def _random_hashtags(rng):
+    # Skewed towards the front of the list so a few tags dominate, like real usage
+    count = rng.randint(0, 5)
+    tags = {HASHTAGS[min(int(rng.paretovariate(1.2)) - 1, len(HASHTAGS) - 1)] for _ in range(count)}
+    return ' '.join(f'#{tag}' for tag in sorted(tags))
+
+
+def _post_rows(rng, user_ids, total_posts, start, now):
+    for i in range(total_posts):
+        created_at = start + timedelta(seconds=rng.randint(0, int((now - start).total_seconds())))
+        status = rng.choices(STATUSES, STATUS_WEIGHTS)[0]
+        hashtags = _random_hashtags(rng)
+        content = _random_text(rng, 30, 250)
+        if hashtags:
+            content = f'{content}\n\n{hashtags}'
+
+        row = {
+            'user_id': user_ids[i % len(user_ids)],
+            'title': _random_text(rng, 3, 8).capitalize(),
+            'content': content,
+            'hashtags': hashtags,
+            'notes': _random_text(rng, 5, 20) if rng.random() < 0.3 else None,
+            'scheduled_date': (now + timedelta(days=rng.randint(1, 60))).date() if status == 'scheduled' else None,
+            'status': status,
+            'engagement_stats': f'{rng.randint(0, 500)} Likes, {rng.randint(0, 80)} Kommentare' if status in ('posted', 'imported') else None,
+            'created_at': created_at,
+            'updated_at': created_at + timedelta(hours=rng.randint(0, 72)),
+            'share_token': None,
+            'is_shared': False
+        }
+        # Roughly one post in a hundred is shared for review
+        if rng.random() < 0.01:
+            row['share_token'] = f'bench{i:027d}'
+            row['is_shared'] = True
+        yield row
+
+
+def _image_rows(rng, post_ids, total_images, now):
+    for i in range(total_images):
+        ext = rng.choice(['jpg', 'png', 'webp'])
+        filename = f'bench_{i}.{ext}'
+        yield {
+            'post_id': rng.choice(post_ids),
+            'filename': filename,
+            'original_filename': f'image_{i}.{ext}',
+            'file_path': os.path.join('app', 'static', 'uploads', 'images', filename),
+            'file_size': rng.randint(20_000, 4_000_000),
+            'mime_type': {'jpg': 'image/jpeg', 'png': 'image/png', 'webp': 'image/webp'}[ext],
+            'uploaded_at': now - timedelta(days=rng.randint(0, 1000))
+        }
+
+
+def _insert_batched(model, rows, total, label):
+    batch = []
+    inserted = 0
+    started = time.perf_counter()
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            db.session.execute(insert(model), batch)
+            db.session.commit()
+            inserted += len(batch)
+            batch = []
+            print(f"   {label}: {inserted}/{total}", end='\r', flush=True)
+    if batch:
+        db.session.execute(insert(model), batch)
+        db.session.commit()
+        inserted += len(batch)
+    print(f"✅ {inserted} {label} inserted in {time.perf_counter() - started:.1f}s")
+
+
+def seed_database(users=100, posts=200_000, images=500_000, seed=42, config_name='development'):
+    """Seed the configured database with benchmark data"""
+    app = create_app(config_name)
+    rng = random.Random(seed)
+
+    with app.app_context():
+        print("🚀 Seeding PostForge benchmark data...")
+        if not bootstrap_application():
+            return False
+
+        if User.query.filter(User.username.like(f'{BENCH_USER_PREFIX}%')).first():
+            print("❌ Benchmark users already exist; use a fresh database")
+            return False
+
+        now = datetime.utcnow()
+        start = now - timedelta(days=3 * 365)
+
+        # Hash once: every benchmark user gets the same password
+        password_hash = generate_password_hash(BENCH_PASSWORD)
+        _insert_batched(User, ({
+            'username': f'{BENCH_USER_PREFIX}{i}',
+            'email': f'{BENCH_USER_PREFIX}{i}@postforge.local',
+            'password_hash': password_hash,
+            'created_at': start,
+            'updated_at': start
+        } for i in range(users)), users, 'users')
+
+        user_ids = [row.id for row in db.session.query(User.id).filter(User.username.like(f'{BENCH_USER_PREFIX}%'))]
+        _insert_batched(Post, _post_rows(rng, user_ids, posts, start, now), posts, 'posts')
+
+        # Bulk inserts skip the ORM events that maintain the hashtag, signature, metrics and rollup tables
+        started = time.perf_counter()
+        indexed = backfill_hashtags(db.session.connection())
+        db.session.commit()
+        print(f"✅ Hashtags of {indexed} posts indexed in {time.perf_counter() - started:.1f}s")
+        started = time.perf_counter()
+        signed = backfill_signatures(db.session.connection())
+        db.session.commit()
+        print(f"✅ Duplicate-detection signatures of {signed} posts computed in {time.perf_counter() - started:.1f}s")
+        captured = backfill_metrics(db.session.connection())
+        db.session.commit()
+        print(f"✅ Engagement metrics of {captured} posts parsed")
+        started = time.perf_counter()
+        months, tags = rebuild_rollups(db.session.connection())
+        db.session.commit()
+        print(f"✅ Analytics rollups rebuilt ({months} months, {tags} hashtags) in {time.perf_counter() - started:.1f}s")
+
+        post_ids = [row.id for row in db.session.query(Post.id).filter(Post.user_id.in_(user_ids))]
+        _insert_batched(Image, _image_rows(rng, post_ids, images, now), images, 'images')
+
+        print("🎉 Benchmark data seeded successfully!")
+        return True
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--posts', type=int, default=200_000)
+    parser.add_argument('--images', type=int, default=500_000)
+    parser.add_argument('--seed', type=int, default=42, help='random seed, for repeatable datasets')
+    parser.add_argument('--config', default=os.getenv('FLASK_CONFIG', 'development'))
+    args = parser.parse_args()
+
+    success = seed_database(args.users, args.posts, args.images, args.seed, args.config)
+    sys.exit(0 if success else 1)
@@ -0,0 +1,15 @@
+"""
+WSGI entrypoint for the standalone share-page server
+
+    gunicorn --workers 4 --bind 0.0.0.0:5001 share_wsgi:app
+
+Serves only public review links (/posts/shared/<token>) with read-only
+database access; route that path prefix (plus /media and /static) to it
+from the front proxy. Run the main app (wsgi.py) for everything else,
+including migrations.
+"""
+
+import os
+from app.share_app import create_share_app
+
+app = create_share_app(os.getenv('FLASK_CONFIG', 'production'))
@@ -1,7 +1,7 @@
 module.exports = {
   content: [
     "./app/templates/**/*.html",
-    "./app/static/js/**/*.js"
+    "./app/static/js/*.js"
   ],
   theme: {
     extend: {
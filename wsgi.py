@@ -0,0 +1,28 @@
+"""
+Production WSGI entrypoint for PostForge
+
+    gunicorn --config gunicorn.conf.py wsgi:app
+
+gunicorn.conf.py enables preload_app, so this module is imported once in the
+master process: migrations and admin bootstrapping run exactly once before
+the workers are forked.
+"""
+
+import os
+import sys
+from app import create_app, db
+from app.utils.bootstrap import bootstrap_application
+
+app = create_app(os.getenv('FLASK_CONFIG', 'production'))
+
+with app.app_context():
+    print("🚀 Starting PostForge application...")
+
+    if not bootstrap_application():
+        sys.exit(1)
+
+    # Connections opened in the master must not be shared with forked workers
+    db.session.remove()
+    db.engine.dispose()
+
+    print("🎉 PostForge application ready")